@@ -0,0 +1,56 @@
+"""
+Measures the cost of composing many apps.
+
+Compares a chain of `+` / `-`, folded or in a loop, against App.hstack / App.vstack / App.grid
+on the same set of leaf apps.
+
+usage: python benchmarks/bench_app_composition.py [n_apps]
+"""
+import contextlib
+import functools
+import io
+import operator
+import sys
+import time
+
+from wridgets.app import App, Field
+
+
+def timeit(func):
+    with contextlib.redirect_stdout(io.StringIO()):
+        t0 = time.perf_counter()
+        obj = func()
+        # composites build their widgets on first access, include that as displaying would
+        obj.app
+        elapsed = time.perf_counter() - t0
+    return elapsed, obj
+
+
+def chain_loop(apps):
+    row = apps[0]
+    for app in apps[1:]:
+        row = row + app
+    return row
+
+
+def main(n=1000):
+    with contextlib.redirect_stdout(io.StringIO()):
+        apps = [Field() for _ in range(n)]
+
+    cases = {
+        'chain +': lambda: functools.reduce(operator.add, apps),
+        'chain -': lambda: functools.reduce(operator.sub, apps),
+        'loop +': lambda: chain_loop(apps),
+        'App.hstack': lambda: App.hstack(*apps),
+        'App.vstack': lambda: App.vstack(*apps),
+        'App.grid': lambda: App.grid(apps, dims=(-1, 10)),
+    }
+    print(f"composing {n} apps")
+    print(f"{'case':<14}{'time (ms)':>12}{'children':>10}{'rows':>8}")
+    for name, func in cases.items():
+        elapsed, obj = timeit(func)
+        print(f"{name:<14}{elapsed * 1e3:>12.1f}{len(obj.children.__dict__):>10}{len(obj.app_layout):>8}")
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,60 @@
+"""
+Measures per-instance construction cost of the default apps.
+
+Constructs N instances of every default app generated on access by
+`wridgets.app.__getattr__` and reports the mean cost of the
+first and last batch, along with the cost of a `set` call on the last
+instance. Flat costs mean class wiring is not repeated per instantiation.
+
+usage: python benchmarks/bench_app_construction.py [n_instances] [n_batches]
+
+The defaults finish in about a minute. Pass a larger n_instances, e.g. 10000,
+to check that costs stay flat over longer runs; that takes about 20 minutes.
+"""
+import contextlib
+import io
+import sys
+import time
+
+from wridgets import app, wridgets
+
+
+def constructible(name):
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            obj = getattr(app, name)()
+        return hasattr(obj, 'wridget')
+    except Exception:
+        return False
+
+
+def bench(name, n, n_batches):
+    cls = getattr(app, name)
+    batch = max(n // n_batches, 1)
+    timings, set_timings = [], []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(n_batches):
+            t0 = time.perf_counter()
+            for _ in range(batch):
+                obj = cls()
+            timings.append((time.perf_counter() - t0) / batch)
+            t0 = time.perf_counter()
+            obj.set(hide=False)
+            set_timings.append(time.perf_counter() - t0)
+    return timings, set_timings
+
+
+def main(n=500, n_batches=10):
+    print(f"{'app':<22}{'first (us)':>12}{'last (us)':>12}{'ratio':>8}{'set first (us)':>16}{'set last (us)':>16}")
+    for name in wridgets.wridget_list:
+        if not constructible(name):
+            print(f"{name:<22}{'skipped':>12}")
+            continue
+        timings, set_timings = bench(name, n, n_batches)
+        first, last = timings[0] * 1e6, timings[-1] * 1e6
+        set_first, set_last = set_timings[0] * 1e6, set_timings[-1] * 1e6
+        print(f"{name:<22}{first:>12.1f}{last:>12.1f}{last / first:>8.2f}{set_first:>16.1f}{set_last:>16.1f}")
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:3]])
@@ -0,0 +1,58 @@
+"""
+Measures import time of the wridgets modules.
+
+Imports each module in a fresh interpreter, after ipywidgets so its own cost is
+excluded, and reports the median time along with whether numpy and
+matplotlib were loaded by the import. Also reports the cost of the first
+access to a generated class.
+
+usage: python benchmarks/bench_import.py [n_runs]
+"""
+import json
+import statistics
+import subprocess
+import sys
+
+SCRIPT = """
+import json, sys, time
+import ipywidgets
+t0 = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t0
+t0 = time.perf_counter()
+getattr({module}, {attr!r}, None)
+first_access = time.perf_counter() - t0
+print(json.dumps(dict(
+    elapsed=elapsed,
+    first_access=first_access,
+    numpy='numpy' in sys.modules,
+    matplotlib='matplotlib' in sys.modules,
+)))
+"""
+
+CASES = [
+    ('wridgets', 'IntSlider'),
+    ('wridgets.app', 'IntSlider'),
+    ('wridgets.plotting', 'MPLFig'),
+]
+
+
+def run(module, attr):
+    out = subprocess.run(
+        [sys.executable, '-c', SCRIPT.format(module=module, attr=attr)],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(n=5):
+    print(f"{'module':<20}{'import (ms)':>14}{'first access (ms)':>20}{'numpy':>8}{'matplotlib':>12}")
+    for module, attr in CASES:
+        results = [run(module, attr) for _ in range(n)]
+        elapsed = statistics.median(r['elapsed'] for r in results) * 1e3
+        first_access = statistics.median(r['first_access'] for r in results) * 1e3
+        print(f"{module:<20}{elapsed:>14.1f}{first_access:>20.2f}{str(results[-1]['numpy']):>8}{str(results[-1]['matplotlib']):>12}")
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,48 @@
+"""
+Measures memory and widget models per leaf app.
+
+Builds a form of N Field apps with App.vstack, once with default apps and once
+with compact apps, each in a fresh interpreter, and reports the bytes
+allocated (tracemalloc) and open widget models per leaf.
+
+usage: python benchmarks/bench_memory.py [n_apps]
+"""
+import json
+import subprocess
+import sys
+
+SCRIPT = """
+import contextlib, gc, io, json, tracemalloc
+from wridgets import app
+with contextlib.redirect_stdout(io.StringIO()):
+    app.Field(compact={compact})
+    n_models = len(app._live_widgets())
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    form = app.App.vstack(*[app.Field(description=str(i), compact={compact}) for i in range({n})])
+    form.app
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+print(json.dumps(dict(nbytes=after - before, models=len(app._live_widgets()) - n_models)))
+"""
+
+
+def run(n, compact):
+    out = subprocess.run(
+        [sys.executable, '-c', SCRIPT.format(n=n, compact=compact)],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(n=1000):
+    print(f"form of {n} Field apps")
+    print(f"{'mode':<10}{'KB / leaf':>12}{'models / leaf':>16}")
+    for compact in [False, True]:
+        result = run(n, compact)
+        print(f"{'compact' if compact else 'default':<10}{result['nbytes'] / n / 1024:>12.1f}{result['models'] / n:>16.2f}")
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,67 @@
+"""
+Compares frames per second of MPLFig updates.
+
+- makefig: rebuilds the figure on every frame (the default path)
+- makefig (reuse_fig): rebuilds the axes on every frame but keeps the figure and canvas
+- update: makefig returns (fig, artists) once, then each frame only sets artist data and blits
+
+Runs on the Agg backend so it measures rendering cost without a frontend. Every frame is
+rasterized once: new figures are drawn explicitly, as a frontend would when displaying them,
+while reused figures are redrawn by MPLFig itself.
+
+usage: python benchmarks/bench_mplfig_blit.py [n_frames] [n_points]
+"""
+import contextlib
+import io
+import sys
+import time
+import warnings
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+from wridgets.plotting import MPLFig
+
+
+def makefig(self, phase=0, n_points=1000):
+    x = np.linspace(0, 10, n_points)
+    fig, ax = self.subplots() if self is not None else plt.subplots()
+    line, = ax.plot(x, np.sin(x + phase))
+    ax.set_ylim(-1.1, 1.1)
+    return fig, {'line': line}
+
+
+def update(self, artists, phase=0, n_points=1000):
+    line = artists['line']
+    x = line.get_xdata()
+    line.set_ydata(np.sin(x + phase))
+
+
+def fps(func, n_frames):
+    t0 = time.perf_counter()
+    for i in range(n_frames):
+        func(i)
+    return n_frames / (time.perf_counter() - t0)
+
+
+def main(n_frames=100, n_points=1000):
+    warnings.simplefilter('ignore')
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = MPLFig(fig=makefig(None, n_points=n_points), makefig=makefig, update=update)
+        full = fps(lambda i: app.makefig(phase=i / 10, n_points=n_points) or app.fig.canvas.draw(), n_frames)
+        app.reuse_fig = True
+        reuse = fps(lambda i: app.makefig(phase=i / 10, n_points=n_points), n_frames)
+        app.makefig(n_points=n_points)
+        app.redraw()
+        blit = fps(lambda i: app.update(phase=i / 10, n_points=n_points), n_frames)
+    print(f"{n_frames} frames, {n_points} points")
+    print(f"{'makefig':<22}{full:>10.1f} fps")
+    print(f"{'makefig (reuse_fig)':<22}{reuse:>10.1f} fps")
+    print(f"{'update':<22}{blit:>10.1f} fps")
+    print(f"{'update speedup':<22}{blit / full:>10.1f}x")
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:3]])
@@ -0,0 +1,44 @@
+"""
+Measures App.set when most values are unchanged.
+
+Re-sends the same options list to a Select, and the same values to a form of
+N Field apps, and reports time per call and the writes suppressed by
+change detection, next to assigning the widget trait directly.
+
+usage: python benchmarks/bench_set.py [n_options] [n_apps]
+"""
+import contextlib
+import io
+import sys
+import time
+
+from wridgets.app import App, Field, Select
+
+
+def timeit(func, repeat=10):
+    with contextlib.redirect_stdout(io.StringIO()):
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - t0) / repeat
+
+
+def main(n_options=100000, n_apps=500):
+    options = [str(i) for i in range(n_options)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        select = Select(options=options)
+        form = App.vstack(*[Field() for _ in range(n_apps)])
+        form.set(value='a', description='b')
+
+    widget = select.wridget.widget
+    t_raw = timeit(lambda: setattr(widget, 'options', options))
+    t_set = timeit(lambda: select.set(options=options))
+    t_form = timeit(lambda: form.set(value='a', description='b'))
+    print(f"{'case':<36}{'time (ms)':>12}{'suppressed':>12}")
+    print(f"{f'widget.options = {n_options} options':<36}{t_raw * 1e3:>12.2f}{'':>12}")
+    print(f"{f'App.set(options={n_options} options)':<36}{t_set * 1e3:>12.2f}{select.sync_stats['suppressed']:>12}")
+    print(f"{f'App.set on {n_apps} unchanged fields':<36}{t_form * 1e3:>12.2f}{form.sync_stats['suppressed']:>12}")
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:3]])
@@ -0,0 +1,49 @@
+"""
+Measures saving and restoring the state of a form.
+
+Builds a form of N Field apps and compares App.snapshot / App.restore against
+App.get / App.set per field, and reports the size of the JSON snapshot.
+
+usage: python benchmarks/bench_snapshot.py [n_apps]
+"""
+import contextlib
+import io
+import sys
+import time
+
+from wridgets.app import App, Field
+
+
+def make_form(n):
+    form = App.vstack(*[Field(description=str(i)) for i in range(n)])
+    # stacks build on first access, as when displayed
+    form.app
+    return form
+
+
+def timeit(func):
+    with contextlib.redirect_stdout(io.StringIO()):
+        t0 = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - t0
+    return elapsed, result
+
+
+def main(n=1000):
+    with contextlib.redirect_stdout(io.StringIO()):
+        source, target = make_form(n), make_form(n)
+        source.set(value='state')
+
+    t_get, values = timeit(lambda: source.get('value'))
+    t_set, _ = timeit(lambda: [target.set(value=value, include=name) for name, value in values.items()])
+    t_snapshot, state = timeit(lambda: source.snapshot(to_json=True))
+    t_restore, _ = timeit(lambda: target.restore(state))
+
+    print(f"form of {n} Field apps, snapshot of {len(state) / 1024:.1f} KB")
+    print(f"{'case':<22}{'save (ms)':>12}{'restore (ms)':>14}")
+    print(f"{'get / set per field':<22}{t_get * 1e3:>12.1f}{t_set * 1e3:>14.1f}")
+    print(f"{'snapshot / restore':<22}{t_snapshot * 1e3:>12.1f}{t_restore * 1e3:>14.1f}")
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:2]])
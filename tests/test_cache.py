@@ -0,0 +1,59 @@
+from wridgets.cache import OutputCache, sizeof_outputs, state_key
+
+
+def stream(text):
+    return {'output_type': 'stream', 'name': 'stdout', 'text': text}
+
+
+def test_evicts_least_recently_used():
+    cache = OutputCache(maxsize=2)
+    cache.put('a', [stream('a')])
+    cache.put('b', [stream('b')])
+    # a hit refreshes a, so b is the oldest
+    assert cache.get('a') == (stream('a'),)
+    cache.put('c', [stream('c')])
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.stats['evictions'] == 1
+
+
+def test_evicts_to_byte_budget():
+    size = sizeof_outputs((stream('x' * 100),))
+    cache = OutputCache(maxsize=10, max_bytes=2 * size)
+    for key in 'abc':
+        cache.put(key, [stream('x' * 100)])
+    assert len(cache) == 2
+    assert cache.nbytes == 2 * size
+    assert cache.get('a') is None
+
+
+def test_skips_outputs_over_budget():
+    cache = OutputCache(max_bytes=10)
+    cache.put('a', [stream('x' * 100)])
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+
+
+def test_put_replaces_key():
+    cache = OutputCache()
+    cache.put('a', [stream('x' * 10)])
+    cache.put('a', [stream('x')])
+    assert len(cache) == 1
+    assert cache.nbytes == sizeof_outputs((stream('x'),))
+
+
+def test_resize_and_clear():
+    cache = OutputCache(maxsize=5)
+    for key in range(5):
+        cache.put(key, [stream(str(key))])
+    cache.resize(maxsize=2)
+    assert len(cache) == 2
+    assert cache.get(4) is not None
+    cache.clear()
+    assert len(cache) == 0 and cache.nbytes == 0
+
+
+def test_state_key():
+    assert state_key({'a': 1}, 2) == state_key({'a': 1}, 2)
+    assert state_key({'a': 1}, 2) != state_key({'a': 2}, 2)
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from wridgets.plotting import Decimator, lttb_decimate, minmax_decimate
+
+
+@pytest.fixture
+def line():
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.uniform(0, 1000, 100_003))
+    y = np.cumsum(rng.normal(size=len(x)))
+    return x, y
+
+
+def in_view(x, y, xmin, xmax):
+    mask = (x >= xmin) & (x <= xmax)
+    return x[mask], y[mask]
+
+
+def test_minmax_decimate_keeps_extremes(line):
+    x, y = line
+    xd, yd = minmax_decimate(x, y, 200)
+    assert len(xd) <= 202
+    assert np.all(np.diff(xd) > 0)
+    assert yd.min() == y.min() and yd.max() == y.max()
+    assert xd[0] == x[0] and xd[-1] == x[-1]
+
+
+def test_minmax_decimate_short_line_is_unchanged():
+    x, y = np.arange(10.), np.arange(10.) ** 2
+    xd, yd = minmax_decimate(x, y, 20)
+    np.testing.assert_array_equal(xd, x)
+    np.testing.assert_array_equal(yd, y)
+
+
+@pytest.mark.parametrize('xmin, xmax', [(0, 1000), (0.5, 999.5), (123.4, 125.1), (400, 700), (990, 2000), (-10, 3)])
+@pytest.mark.parametrize('n_out', [8, 100, 1000])
+def test_decimator_view_keeps_extremes(line, xmin, xmax, n_out):
+    x, y = line
+    decimator = Decimator(x, y)
+    xd, yd = decimator(xmin, xmax, n_out)
+    _, yv = in_view(x, y, xmin, xmax)
+    # one extra point on each side of the view, the pyramid's whole blocks plus the partial edge blocks
+    assert len(xd) <= n_out + 6
+    assert np.all(np.diff(xd) > 0)
+    assert yv.min() in yd and yv.max() in yd
+
+
+def test_decimator_small_view_is_raw(line):
+    x, y = line
+    xv, yv = in_view(x, y, 500, 500.2)
+    xd, yd = Decimator(x, y)(500, 500.2, len(xv) + 10)
+    assert set(xv) <= set(xd)
+    assert len(xd) <= len(xv) + 2
+
+
+def test_decimator_empty_view(line):
+    x, y = line
+    xd, yd = Decimator(x[:0], y[:0])(0, 1, 100)
+    assert len(xd) == len(yd) == 0
+
+
+def test_decimator_lttb(line):
+    x, y = line
+    xd, yd = Decimator(x, y, method='lttb')(100, 900, 300)
+    assert len(xd) == 300
+    assert np.all(np.diff(xd) > 0)
+
+
+def test_lttb_decimate_keeps_endpoints(line):
+    x, y = line
+    xd, yd = lttb_decimate(x, y, 50)
+    assert len(xd) == 50
+    assert (xd[0], yd[0]) == (x[0], y[0]) and (xd[-1], yd[-1]) == (x[-1], y[-1])
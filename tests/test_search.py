@@ -0,0 +1,58 @@
+import random
+import string
+
+import pytest
+
+from wridgets.search import OptionIndex, _is_subsequence
+
+
+@pytest.fixture(scope='module')
+def labels():
+    rng = random.Random(0)
+    return [''.join(rng.choice(string.ascii_letters + ' _') for _ in range(rng.randint(1, 12))) for _ in range(3000)]
+
+
+@pytest.fixture(scope='module')
+def index(labels):
+    return OptionIndex(labels)
+
+
+QUERIES = ['', 'a', 'Ab', 'abc', 'xYz', 'e_', ' q', 'zzzz', 'the']
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_prefix_matches_scan(index, labels, query):
+    expected = {i for i, label in enumerate(labels) if label.lower().startswith(query.lower())}
+    assert set(index.prefix(query)) == expected
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_substring_matches_scan(index, labels, query):
+    expected = [i for i, label in enumerate(labels) if query.lower() in label.lower()]
+    assert index.substring(query) == expected
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_fuzzy_matches_scan(index, labels, query):
+    expected = [i for i, label in enumerate(labels) if _is_subsequence(query.lower(), label.lower())]
+    assert index.fuzzy(query) == expected
+
+
+@pytest.mark.parametrize('mode', OptionIndex.modes)
+def test_within_narrows_previous_query(index, mode):
+    previous = index.search('a', mode=mode)
+    assert sorted(index.search('ab', mode=mode, within=previous)) == sorted(index.search('ab', mode=mode))
+
+
+def test_options_as_pairs():
+    index = OptionIndex([('Apple', 1), ('apricot', 2), ('Banana', [3])])
+    assert [index.option(i) for i in index.prefix('ap')] == [('Apple', 1), ('apricot', 2)]
+    assert index.position(2) == 1
+    # unhashable values fall back to a scan
+    assert index.position([3]) == 2
+    assert index.position(4) is None
+
+
+def test_rank_prefers_early_match_then_short_label():
+    index = OptionIndex(['xxab', 'ab', 'abcdef', 'zab'])
+    assert index.rank('ab', range(len(index)), k=3) == [1, 2, 3]
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from wridgets.app import App, Field, Label, Select, VirtualSelect
+
+OPTIONS = [f'option {i}' for i in range(1000)]
+
+
+def make_form():
+    return App.vstack(
+        Field(name='A'),
+        Select(options=['a', 'b'], name='S'),
+        Label(name='L', text='x'),
+        VirtualSelect(options=OPTIONS),
+    )
+
+
+def virtual_select(app):
+    return next(member for member in app._stack_members if isinstance(member, VirtualSelect))
+
+
+def test_round_trip():
+    src, dst = make_form(), make_form()
+    src.set(value='hello', include='A')
+    src.set(value='b', include='S')
+    virtual_select(src).select('option 500')
+    state = src.snapshot()
+    # selections are kept by index, display widgets are skipped
+    assert state['index']['S'] == 1
+    assert 'L' not in state['value']
+    dst.restore(state)
+    assert dst.get('value', include=['A', 'S']) == {'A': 'hello', 'S': 'b'}
+    assert virtual_select(dst).value == 'option 500'
+
+
+def test_round_trip_json():
+    src, dst = make_form(), make_form()
+    src.set(value='hello', include='A')
+    dst.restore(src.snapshot(to_json=True))
+    assert json.loads(src.snapshot(to_json=True)) == dst.snapshot()
+
+
+def test_nested_apps():
+    class Form(App):
+        def make(self, **kwargs):
+            self.core = Field(name='X') + VirtualSelect(options=OPTIONS)
+
+    src, dst = Form() - Form(), Form() - Form()
+    forms = [app for _, app in src._composed_apps()]
+    forms[1].core._stack_members[1].select('option 7')
+    forms[0].set(value='first', include='X')
+    state = src.snapshot()
+    assert list(state['apps']) == ['Form', 'Form2']
+    dst.restore(state)
+    forms = [app for _, app in dst._composed_apps()]
+    assert [form.core._stack_members[1].value for form in forms] == [None, 'option 7']
+    assert [form.get('value', include='X') for form in forms] == [{'X': 'first'}, {'X': ''}]
+
+
+def test_version_mismatch():
+    app = make_form()
+    state = app.snapshot()
+    state['version'] += 1
+    with pytest.raises(AssertionError):
+        app.restore(state)
@@ -1,7 +1,19 @@
 from .utils import GridBox2
 from .version import __version__
-from .wridgets import *
+# a star import would generate every wridget class, so only the static names are imported here
+from .wridgets import FileLink, HBox, Layout, Output, Style, VBox, Wridget, clear_output, display, link, widgets, wridget_list
+from . import wridgets as _wridgets
 import logging
 from ipywidgets import __version__ as ipywidgets_version
 if int(ipywidgets_version.split('.')[0]) < 8:
-    logging.warning(f'you have ipywidgets version {ipywidgets_version} which is incompatible with some features of wridgets version {__version__}.')
\ No newline at end of file
+    logging.warning(f'you have ipywidgets version {ipywidgets_version} which is incompatible with some features of wridgets version {__version__}.')
+
+
+def __getattr__(name):
+    # wridget classes are generated on first access, see wridgets.wridgets.__getattr__
+    if name in _wridgets.wridget_list:
+        return getattr(_wridgets, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ['GridBox2', *_wridgets.__all__]
@@ -1,16 +1,45 @@
+import contextlib
 import functools
+import inspect
+import json
+import threading
 import traceback
+import weakref
+from collections import OrderedDict, deque
 from hashlib import md5
 
 from . import wridgets
 from IPython.display import display
+import ipywidgets
 from ipywidgets import VBox, HBox, Output
-from .utils import unwrap, wrap
+from .cache import OutputCache, state_key
+from .search import OptionIndex
+from .utils import append_outputs, capture_outputs, close_widget, grid_dims, running_loop, unwrap, wrap, widget_models
 
 
 class App:
     is_wrapp = False
-    _disable_build = False
+    _batch_depth = 0
+    _build_pending = False
+    _stack_orientation = None
+    _members = ()
+    _base = None
+    _log = None
+    _n_log = 0
+    _lazy_kwargs = None
+    _lazy_sets = ()
+    _closed = False
+    _clear_button = None
+    _error_app = None
+    _traceback_button = None
+    _msg_app = None
+    _msg_label = None
+    _instances = weakref.WeakSet()
+    _app = None
+    _owns_output = False
+    _deferred_build = False
+    _grid_dims = None
+    _base_methods = None
     trait_names = (
         'prefix', 
         'name',
@@ -19,7 +48,9 @@ class App:
         'propagate',
         'hide',
         'minimize',
-        'clear_previous_output'
+        'clear_previous_output',
+        'lazy',
+        'compact'
     )
 
     @classmethod
@@ -37,11 +68,29 @@ class App:
         setattr(cls, store, getattr(cls, store).setter(setter_lda))
 
     def display(self):
+        self.materialize()
         display(
             self.app
         )
+        if self.compact and not self.display_output:
+            display(self.output)
     
     def with_output(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                # holding `with self.output:` across awaits leaks output between tasks, so the run is captured
+                # and appended once done. A cancelled run propagates and shows nothing
+                result = None
+                with capture_outputs() as recorder:
+                    try:
+                        result = await func(self, *args, **kwargs)
+                    except Exception as e:
+                        self._display_exception(e)
+                append_outputs(self.output, recorder.outputs, clear=self.clear_previous_output or recorder.cleared)
+                return result
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(self, *args, **kwargs):
             with self.output:
@@ -50,22 +99,73 @@ class App:
                 try:
                     return func(self, *args, **kwargs)
                 except Exception as e:
-                    (
-                        Button(
-                            on_interact=self.output.clear_output,
-                            button_style='warning',
-                            description='Clear'
-                        ) + \
-                        Button(
-                            on_interact=self.print_traceback,
-                            on_interact_kws=dict(tb=traceback.format_exc()),
-                            button_style='info',
-                            description='Traceback'
-                        )
-                    ).display()
-                    print(e)
+                    self._display_exception(e)
         return wrapper
+
+    def no_output(func):
+        """
+        Marks a method to be left out of the automatic with_output wrapping, e.g. for hot paths or methods run on other threads.
+        """
+        func._no_output = True
+        return func
+
+    def _display_exception(self, e):
+        # the buttons are made once per app and redisplayed, only the traceback changes
+        if self._error_app is None:
+            self._traceback_button = Button(
+                on_interact=self.print_traceback,
+                button_style='info',
+                description='Traceback'
+            )
+            self._error_app = self.clear_button + self._traceback_button
+        self._traceback_button.wridget.on_interact_kws = dict(tb=traceback.format_exc())
+        self._error_app.display()
+        print(e)
     
+    @staticmethod
+    def cached_output(maxsize=128, max_bytes=None):
+        """
+        Memoizes the output a method displays, keyed on the values of the app's children and the call arguments.
+        On a hit, the captured outputs are replayed into the app output instead of calling the method.
+
+        :param maxsize: (int) max number of cached outputs per app
+        :param max_bytes: (int) max estimated bytes of cached outputs per app. None for no budget
+
+        Usage:
+            class Plot(App):
+                @App.cached_output(maxsize=32)
+                def plot(self):
+                    ...
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(self, *args, **kwargs):
+                if func.__name__ not in self._caches:
+                    self._caches[func.__name__] = OutputCache(maxsize=maxsize, max_bytes=max_bytes)
+                cache = self._caches[func.__name__]
+                key = state_key(self.get('value', children_only=True), args, kwargs)
+                # with_output has already cleared the Output if clear_previous_output, so its outputs trait may be stale
+                outputs = cache.get(key)
+                if outputs is not None:
+                    append_outputs(self.output, outputs, clear=self.clear_previous_output)
+                    return
+                try:
+                    with capture_outputs() as recorder:
+                        result = func(self, *args, **kwargs)
+                finally:
+                    append_outputs(self.output, recorder.outputs, clear=self.clear_previous_output or recorder.cleared)
+                if recorder.outputs:
+                    cache.put(key, recorder.outputs)
+                return result
+            return wrapper
+        return decorator
+
+    def cache_stats(self):
+        """
+        Returns hit / miss / eviction counts per method decorated with cached_output.
+        """
+        return {name: dict(cache.stats, size=len(cache), nbytes=cache.nbytes) for name, cache in self._caches.items()}
+
     def print_traceback(self, tb):
         with self.output:
             self.output.clear_output()
@@ -74,43 +174,61 @@ class App:
     
     def __new__(cls, *args, **kwargs):
         obj = object.__new__(cls)
-        obj.app = VBox()
-        
+        App._instances.add(obj)
+        return obj
+    
+    def __init_subclass__(cls):
+        # automatically assign output to methods
+        if App._base_methods is None:
+            App._base_methods = frozenset(func for func in dir(App) if callable(getattr(App, func)))
+        method_list = [func for func in dir(cls) if func not in App._base_methods and callable(getattr(cls, func))]
+        for method in method_list:
+            if not getattr(getattr(cls, method), '_no_output', False):
+                setattr(cls, method, cls.with_output(getattr(cls, method)))
+        cls._init_class()
+
+    @classmethod
+    def _init_class(cls):
+        """
+        Wires traits, stores and build wrappers once per class.
+        """
         for trait in cls.trait_names:
-            cls._disable_build = True
-            cls._init_trait(trait)
-            cls._disable_build = False
+            # output is a lazy property defined on App
+            if trait != 'output':
+                cls._init_trait(trait)
 
         # set store
         if hasattr(cls, 'store_config'):
             for row in cls.store_config:
                 row = wrap(row)
                 cls._init_store(store=row[0])
-        
-        cls.make = cls._build(cls.make)
-        cls.set = cls._build(cls.set)
-        return obj
-    
-    def __init_subclass__(cls):
-        # automatically assign output to methods
-        base_method_list = [func for func in dir(App) if callable(getattr(App, func))]
-        method_list = [func for func in dir(cls) if callable(getattr(cls, func)) and func not in base_method_list]
-        for method in method_list:
-            setattr(cls, method, cls.with_output(getattr(cls, method)))
+
+        # only wrap methods defined on this class, inherited ones are already wrapped
+        for method in ['make', 'set']:
+            if method in cls.__dict__:
+                setattr(cls, method, cls._build(cls.__dict__[method]))
     
-    def __init__(self, core=None, prefix=None, name=None, output=None, display_output=None, propagate=None, hide=None, minimize=None, clear_previous_output=None, **kwargs):
+    def __init__(self, core=None, prefix=None, name=None, output=None, display_output=None, propagate=None, hide=None, minimize=None, clear_previous_output=None, lazy=None, compact=None, **kwargs):
         self._config = {}
         self._store = {}
         self._core = None
         self._defaults = {}
+        self._rows = {}
+        self._dependencies = {}
+        self._results = {}
+        self._observed = set()
+        self._caches = {}
         prefix = self.setdefault('prefix', prefix if prefix is not None else '')
         self.setdefault('name', prefix + (name if name is not None else self.__class__.__name__))
-        self.setdefault('output', output if output is not None else Output())
-        self.setdefault('display_output', display_output if display_output is not None else True)
+        compact = self.setdefault('compact', compact if compact is not None else False)
+        # created on first use when not given, compact apps share the Output of their root, see _adopt_output
+        self.setdefault('output', output)
+        self.setdefault('display_output', display_output if display_output is not None else not compact)
         self.setdefault('propagate', propagate if propagate is not None else False)
         self.setdefault('hide', hide if hide is not None else False)
         self.setdefault('minimize', minimize if minimize is not None else False)
         self.setdefault('clear_previous_output', clear_previous_output if clear_previous_output is not None else True)
+        self.setdefault('lazy', lazy if lazy is not None else False)
         self.defaults.update(kwargs)
         # UPDATE STORE
         if hasattr(self, 'store_config'):
@@ -131,21 +249,80 @@ class App:
         self.set_trait_defaults(build=False)
 
         # RUN MAKE
-        self.make(**kwargs)
+        if self.lazy and (self.hide or self.minimize):
+            # defer make until displayed or shown, register self so composites can reach it
+            self._lazy_kwargs = kwargs
+            self._lazy_sets = []
+            setattr(self.children, self.name, self)
+        else:
+            self.make(**kwargs)
     
     def set_trait_defaults(self, build=True):
-        self._disable_build = True
-        self.prefix = self.getdefault('prefix')
-        self.name = self.getdefault('name')
-        self.output = self.getdefault('output') 
-        self.display_output = self.getdefault('display_output')
-        self.propagate = self.getdefault('propagate')
-        self.hide = self.getdefault('hide')
-        self.minimize = self.getdefault('minimize')
-        self.clear_previous_output = self.getdefault('clear_previous_output')
-        self._disable_build = False
-        if build:
-            self.build()
+        with self.batch(build=build, sync=False):
+            self.prefix = self.getdefault('prefix')
+            self.name = self.getdefault('name')
+            self.output = self.getdefault('output') 
+            self.display_output = self.getdefault('display_output')
+            self.propagate = self.getdefault('propagate')
+            self.hide = self.getdefault('hide')
+            self.minimize = self.getdefault('minimize')
+            self.clear_previous_output = self.getdefault('clear_previous_output')
+            self.lazy = self.getdefault('lazy')
+            self.compact = self.getdefault('compact')
+
+    @contextlib.contextmanager
+    def batch(self, build=True, sync=True):
+        """
+        Defers build until the outermost batch exits.
+
+        :param build: (bool) run a pending build on exit
+        :param sync: (bool) hold widget syncs so updates reach the frontend together
+
+        Usage:
+            with app.batch():
+                app.set(hide=False, value=1)
+        """
+        with contextlib.ExitStack() as stack:
+            if sync:
+                if self._app is not None:
+                    stack.enter_context(self._app.hold_sync())
+                for wridget in self.wridgets().values():
+                    stack.enter_context(wridget.widget.hold_sync())
+            self._batch_depth += 1
+            stack.callback(self._exit_batch, build=build)
+            for _, child in self.children:
+                if child is not self and isinstance(child, App):
+                    stack.enter_context(child.batch(build=build, sync=sync))
+            yield self
+
+    @property
+    def is_materialized(self):
+        return self._lazy_kwargs is None
+
+    def materialize(self):
+        """
+        Runs the deferred make of a lazy app, then replays the settings buffered by set.
+        """
+        if self._lazy_kwargs is not None:
+            kwargs, sets = self._lazy_kwargs, self._lazy_sets
+            self._lazy_kwargs = None
+            self._lazy_sets = ()
+            if self.children.__dict__.get(self.name) is self:
+                delattr(self.children, self.name)
+            with self.batch(sync=False):
+                self.make(**kwargs)
+                for include, exclude, kws in sets:
+                    self.set(include=include, exclude=exclude, **kws)
+            _invalidate_model_ids()
+        return self
+
+    def _exit_batch(self, build=True):
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            pending = self._build_pending
+            self._build_pending = False
+            if build and pending:
+                self.build()
 
     @property
     def core(self):
@@ -153,16 +330,91 @@ class App:
 
     @core.setter
     def core(self, core):
+        if self._core is not None:
+            _invalidate_model_ids()
+        if self._app is not None and core._app is not self._app:
+            # the box may already be displayed or composed, e.g. the placeholder of a lazy app, so the core takes it over
+            if self._core is not None and self._core._app is self._app:
+                self._core._app = None
+            box, core._app = core._app, self._app
+            if box is not None:
+                self._app.children = box.children
+                close_widget(box)
+            elif core._deferred_build:
+                core._deferred_build = False
+                core.build()
         self.app = core.app
-        self._app_layout = core._app_layout
+        self._app_layout = core.app_layout
         self.children = core.children
+        self._rows = core._rows
         self._core = core
 
     def make(self, **kwargs):
         pass
+
+    @property
+    def children(self):
+        if self._log is not None:
+            self._resolve()
+        return self._children
+
+    @children.setter
+    def children(self, children):
+        self._children = children
+
+    @property
+    def _stack_members(self):
+        if self._log is not None:
+            self._resolve()
+        return self._members
+
+    @property
+    def app(self):
+        # created on first use so apps with a core never make their own, and stacks only build once needed
+        if self._app is None:
+            self._app = VBox()
+            if self._deferred_build:
+                self._deferred_build = False
+                self.build()
+        return self._app
+
+    @property
+    def output(self):
+        output = self._config.get('output')
+        if output is None:
+            wridget = getattr(self, 'wridget', None)
+            if self.compact and wridget is not None:
+                # a compact wridget makes its own on interaction when the app had none yet, take it over
+                output = wridget.output
+                wridget._owns_output = False
+            else:
+                output = Output()
+            self._owns_output = True
+            self._config['output'] = output
+            # reset restores it from the defaults
+            self.updatedefault('output', output)
+            if self.compact:
+                # a compact root makes one Output for its tree
+                for member in self._stack_members:
+                    member._adopt_output(output)
+        return output
+
+    @output.setter
+    def output(self, output):
+        self._config.update({'output': output})
+        self.build()
+
+    @app.setter
+    def app(self, app):
+        self._app = app
     
     @property
     def app_layout(self):
+        if self._app_layout is None:
+            # composites resolve their layout from their members on first use
+            members = self._stack_members
+            n_rows, n_cols = self._grid_dims or ((1, len(members)) if self._stack_orientation == 'h' else (len(members), 1))
+            self._app_layout = [[member.app for member in members[n_cols * r: n_cols * (r + 1)]] for r in range(n_rows)]
         return self._app_layout
     
     @property
@@ -187,22 +439,68 @@ class App:
 
     @property
     def clear_button(self):
-        return Button(description='Clear', button_style='warning', on_interact=self.clear_output)
+        if self._clear_button is None:
+            self._clear_button = Button(description='Clear', button_style='warning', on_interact=self.clear_output)
+        return self._clear_button
 
     def msg(self, msg:str, with_clear_button=True):
         clear_button = self.clear_button if with_clear_button else None
+        # the previous message is replaced, close what it created but keep the shared clear button
+        if self._msg_label is not None:
+            self._msg_label.close()
+            self._msg_label = None
+        if self._msg_app is not None:
+            self._msg_app._close_layout()
         with self.output:
             self.clear_output()
             if isinstance(msg, str):
-                (
-                    Label(text=msg, fontsize=0.5) + \
-                    clear_button
-                ).display()
-            else:
-                (
-                    msg + \
-                    clear_button
-                ).display()
+                self._msg_label = Label(text=msg, fontsize=0.5)
+                msg = self._msg_label
+            self._msg_app = msg + clear_button
+            self._msg_app.display()
+
+    def close(self):
+        """
+        Closes the widget models of this app, its children and the apps it composes, then its Output and row boxes.
+        
+        A closed app cannot be displayed again.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._lazy_kwargs = None
+        for _, child in self.children:
+            if child is not self and isinstance(child, App):
+                child.close()
+        for member in self._stack_members:
+            member.close()
+        for app in [self.core, self._msg_label, self._msg_app, self._error_app, self._clear_button]:
+            if app is not None:
+                app.close()
+        for cache in self._caches.values():
+            cache.clear()
+        self._close_layout()
+
+    def _close_layout(self):
+        for widget in self._own_widgets():
+            close_widget(widget)
+        self._rows.clear()
+
+    def _own_widgets(self):
+        """
+        Yields the widgets created by this app itself, not by its children.
+        """
+        yield from self._rows.values()
+        if self._owns_output and self._config.get('output') is not None:
+            yield self._config['output']
+        if self._app is not None:
+            yield self._app
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
     
     def _build(func):
         @functools.wraps(func)
@@ -212,68 +510,235 @@ class App:
         return wrapper
     
     def build(self):
-        if not self._disable_build:
+        if self._batch_depth > 0:
+            self._build_pending = True
+        elif self._lazy_kwargs is not None and not (self.hide or self.minimize):
+            self.materialize()
+        elif self._deferred_build and self._app is None:
+            # nothing shows this stack yet, app builds it on first access
+            pass
+        else:
+            children = self._build_rows()
             if self.display_output:
-                self.app.children = [HBox(row) for row in self.app_layout] + [self.output]
-            else:
-                self.app.children = [HBox(row) for row in self.app_layout]
-            
-            self.app.layout.visibility = 'hidden' if self.hide else None
-            self.app.layout.display = 'none' if self.minimize else None
+                children.append(self.output)
+            if tuple(children) != tuple(self.app.children):
+                self.app.children = children
+
+            visibility = 'hidden' if self.hide else None
+            if self.app.layout.visibility != visibility:
+                self.app.layout.visibility = visibility
+            display = 'none' if self.minimize else None
+            if self.app.layout.display != display:
+                self.app.layout.display = display
+
+    def _build_rows(self):
+        """
+        Returns an HBox per layout row, reusing cached HBoxes for rows whose widgets are unchanged.
+
+        Compact apps place single widget rows as is.
+        """
+        rows = {}
+        for row in self.app_layout:
+            if self.compact and len(row) == 1:
+                continue
+            key = tuple(id(widget) for widget in row)
+            if key not in rows:
+                rows[key] = self._rows[key] if key in self._rows else HBox(row)
+        for key, row in self._rows.items():
+            if key not in rows:
+                close_widget(row)
+        # mutate in place since the cache is shared with core
+        self._rows.clear()
+        self._rows.update(rows)
+        return [
+            row[0] if self.compact and len(row) == 1 else rows[tuple(id(widget) for widget in row)] 
+            for row in self.app_layout
+        ]
 
     @property
     def model_id(self):
-        if not isinstance(self, WrApp):
-            ids = []
-            for _, value in self.children:
-                model_id = getattr(value, 'model_id', None)
-                model_id = value.wridget.widget.model_id if model_id is None else model_id
-                ids.append(model_id)
-            encoded = ''.join(ids).encode()
-            dhash = md5()
-            dhash.update(encoded)
-            return dhash.hexdigest()
+        if self._lazy_kwargs is not None:
+            return self.app.model_id
+        elif not isinstance(self, WrApp):
+            return self.children._hexdigest()
         else:
             return self.wridget.widget.model_id
 
     def _union(self, other):
-        if isinstance(other, App):
-            obj = App()
-            obj.children = self.children + other.children
-            for source in [self, other]:
-                if source.propagate:
-                    setattr(obj.children, source.name, source)
-            return obj
+        return App._compose([self, other])
+
+    def _is_stack(self, orientation):
+        """
+        True if this app is an unmodified composite made by stacking apps in orientation.
+        """
+        return (
+            type(self) is App
+            and orientation is not None
+            and self._stack_orientation == orientation
+            and not (self.propagate or self.hide or self.minimize)
+        )
+
+    @staticmethod
+    def _composite(compact=False):
+        # widgets are made when the composite is first shown, see App.app
+        obj = App.__new__(App)
+        obj._deferred_build = True
+        if compact:
+            obj.__init__(compact=True, display_output=True)
+        else:
+            obj.__init__()
+        obj._app_layout = None
+        obj._members = []
+        return obj
+
+    @staticmethod
+    def _compose(apps, flatten=()):
+        """
+        Merges the children of apps into a new App.
+
+        :param apps: (list) apps to compose, None entries are skipped
+        :param flatten: (tuple) stacks among apps whose members are taken over instead of the stack itself
+
+        :returns: App, with the composed apps in _stack_members
+        """
+        apps = [app for app in apps if app is not None]
+        for app in apps:
+            if not isinstance(app, App):
+                raise TypeError(f'Cannot add type {type(apps[0])} to type {type(app)}.')
+
+        # a tree of compact apps shares the output of its root, which displays it
+        obj = App._composite(compact=any(app.compact for app in apps))
+        for app in apps:
+            obj._add(app, flatten=any(app is stack for stack in flatten))
+        return obj
+
+    def _add(self, app, flatten=False):
+        for name, value in app.children:
+            setattr(self._children, name, value)
+        if app.propagate:
+            setattr(self._children, app.name, app)
+        if flatten:
+            self._members.extend(app._stack_members)
         else:
+            self._members.append(app)
+
+    def _chain(self, other, orientation):
+        """
+        Stacks self and other for + and -, taking over the members of stacks in orientation.
+
+        Each step only logs the app it adds on top of the first stack of the chain, the log is merged 
+        once the result is first used. So a + b + c and loops like row = row + app cost O(1) per step.
+        """
+        if not isinstance(other, App):
             raise TypeError(f'Cannot add type {type(self)} to type {type(other)}.')
-    
-    def _horizontal_app_layout(self, other):
-        return [
-            [
-                self.app, other.app
-            ]
-        ]
-    
-    def _vertical_app_layout(self, other):
-        return [
-            [
-                self.app
-            ],
-            [
-                other.app
-            ]
-        ]
-    
+        flatten = other._is_stack(orientation)
+        if not self._is_stack(orientation):
+            return App._stack([self, other], orientation, flatten=(other,) if flatten else ())
+        obj = App._composite(compact=self.compact or other.compact)
+        obj._stack_orientation = orientation
+        if self._log is not None:
+            obj._base, obj._log, obj._n_log = self._base, self._log, self._n_log
+        else:
+            obj._base, obj._log, obj._n_log = self, [], 0
+        if len(obj._log) != obj._n_log:
+            # another chain already extended the shared log past self
+            obj._log = obj._log[:obj._n_log]
+        obj._log.append((other, flatten))
+        obj._n_log += 1
+        return obj
+
+    def _resolve(self):
+        """
+        Merges the log of a chained stack onto a copy of the stack it started from.
+        """
+        base, log = self._base, self._log[:self._n_log]
+        self._base = self._log = None
+        self._children = base.children._copy()
+        self._members = list(base._stack_members)
+        for app, flatten in log:
+            self._add(app, flatten=flatten)
+
+    def _adopt_output(self, output):
+        """
+        Points compact apps that do not display their output, and their wridgets, to the output of their root. 
+        Compact composites stop displaying their own output, so a stack of stacks shows one Output.
+        """
+        apps = [self] + [child for _, child in self.children if isinstance(child, App) and child is not self]
+        for app in apps:
+            if not app.compact or app._config.get('output') is output:
+                continue
+            if app._stack_members:
+                app._config['display_output'] = False
+                app.updatedefault('display_output', False)
+                for member in app._stack_members:
+                    member._adopt_output(output)
+            elif app.display_output:
+                continue
+            previous = app._config.get('output') if app._owns_output else None
+            app._config['output'] = output
+            app.updatedefault('output', output)
+            app._owns_output = False
+            wridget = getattr(app, 'wridget', None)
+            if wridget is not None:
+                if wridget._owns_output and wridget._config.get('output') is not None:
+                    close_widget(wridget._config['output'])
+                wridget.output = output
+            if previous is not None:
+                close_widget(previous)
+            if app._stack_members and app._app is not None:
+                app.build()
+
+    @staticmethod
+    def _stack(apps, orientation, flatten=()):
+        obj = App._compose(apps, flatten=flatten)
+        obj._stack_orientation = orientation
+        return obj
+
+    @staticmethod
+    def hstack(*apps):
+        """
+        Composes apps side by side in a single row. Like a + b + c, except that stacks among apps are kept as members, 
+        so their own hide and minimize still apply. a + b + c takes over their members.
+
+        :param apps: apps to compose
+
+        :returns: App
+        """
+        return App._stack(apps, orientation='h')
+
+    @staticmethod
+    def vstack(*apps):
+        """
+        Composes apps top to bottom in a single column. Like a - b - c, except that stacks among apps are kept as members, 
+        so their own hide and minimize still apply. a - b - c takes over their members.
+
+        :param apps: apps to compose
+
+        :returns: App
+        """
+        return App._stack(apps, orientation='v')
+
+    @staticmethod
+    def grid(apps, dims=(3, -1)):
+        """
+        Composes apps in rows and columns.
+
+        :param apps: (list) apps to compose
+        :param dims: (tuple) n_rows, n_cols. one dim may be -1 to fit all apps
+
+        :returns: App
+        """
+        obj = App._compose(apps)
+        obj._grid_dims = grid_dims(len(obj._stack_members), dims)
+        return obj
+
     def __radd__(self, other):
         if other is None:
             return self
 
     def __add__(self, other):
         if other is not None:
-            obj = self._union(other)
-            obj._app_layout = self._horizontal_app_layout(other)
-            obj.build()
-            return obj
+            return self._chain(other, 'h')
         else:
             return self
 
@@ -283,33 +748,117 @@ class App:
     
     def __sub__(self, other):
         if other is not None:
-            obj = self._union(other)
-            obj._app_layout = self._vertical_app_layout(other)
-            obj.build()
-            return obj
+            return self._chain(other, 'v')
         else:
             return self
     
+    def add_dependency(self, name, func, on):
+        """
+        Registers a computation that reruns only when the children or computations it depends on change value.
+
+        :param name: (str) name of the computation. other computations can depend on it by name
+        :param func: (callable) called with the current value of each name in `on` as kwargs
+        :param on: (str or list) names of child wridgets and/or previously added computations
+
+        Usage:
+            app.add_dependency('total', lambda A, B: A + B, on=['A', 'B'])
+            app.add_dependency('label', lambda total: print(total), on='total')
+        """
+        on = tuple(wrap(on))
+        wrapps = self.children._get_wrapps()
+        for source in on:
+            assert source in wrapps or source in self._dependencies, f'{source} is not a child wridget or computation'
+        self._dependencies[name] = (func, on)
+        for source in on:
+            if source in wrapps and source not in self._observed:
+                wrapps[source].wridget.widget.observe(functools.partial(self._on_dependency_change, source), names='value')
+                self._observed.add(source)
+        self.recompute(name)
+
+    def remove_dependency(self, name):
+        dependents = [k for k, (_, on) in self._dependencies.items() if name in on]
+        assert not dependents, f'{dependents} depend on {name}'
+        self._dependencies.pop(name)
+        self._results.pop(name, None)
+
+    def get_result(self, name):
+        """
+        Returns the last result of a computation added with add_dependency.
+        """
+        return self._results.get(name)
+
+    def _on_dependency_change(self, source, change):
+        self.recompute(dirty=source)
+
+    @with_output
+    def recompute(self, name=None, dirty=None):
+        """
+        Reruns computations in the order they were added, skipping those that are not downstream of what changed.
+
+        :param name: (str or list) computations to rerun along with their dependents. all if name and dirty are None
+        :param dirty: (str or list) children whose value changed
+        """
+        if name is None and dirty is None:
+            dirty = set(self._dependencies)
+        else:
+            dirty = set(wrap(dirty) if dirty is not None else []) | set(wrap(name) if name is not None else [])
+        wrapps = self.children._get_wrapps()
+        for comp, (func, on) in list(self._dependencies.items()):
+            if comp in dirty or dirty.intersection(on):
+                kwargs = {source: self._results.get(source) if source in self._dependencies else wrapps[source].wridget.widget.value for source in on}
+                self._results[comp] = func(**kwargs)
+                dirty.add(comp)
+
     def wridgets(self, include=None, exclude=None):
-        wridgets = {}
-        for name, value in self.children:
-            if isinstance(value, WrApp):
-                wridgets[name] = value
-        
-        subset = set(wridgets.keys())
-        if include is not None:
-            subset = set(wridgets.keys()).intersection(wrap(include))
-        if exclude is not None:
-            subset = set(wridgets.keys()).difference(wrap(exclude))
-        return {k: v.wridget for k, v in wridgets.items() if k in subset}
+        wrapps = self.children._get_wrapps()
+        return {name: wrapps[name].wridget for name in self.children._select(include=include, exclude=exclude)}
 
     def get(self, name, include=None, exclude=None, skip_children=False, children_only=False):
         if not children_only:
             if name in self.trait_names:
                 return getattr(self, name)
         if not skip_children:
+            if self._lazy_kwargs is not None:
+                pending = self._get_pending(name, include=include, exclude=exclude)
+                if pending is not None:
+                    return pending
+                self.materialize()
             wridgets = self.wridgets(include=include, exclude=exclude)
-            return {wridget_name: wridget.get(name) for wridget_name, wridget in wridgets.items()}
+            values = {wridget_name: wridget.get(name) for wridget_name, wridget in wridgets.items()}
+            for key, child, filters in self._lazy_children(include=include, exclude=exclude):
+                value = child.get(name, children_only=True, **filters)
+                values.update({key: unwrap(list(value.values()))} if child.is_wrapp else value)
+            return values
+
+    def _lazy_children(self, include=None, exclude=None):
+        """
+        Yields key, app and the include / exclude to forward for lazy children added before they materialized.
+
+        WrApps are filtered here by the name they hold in this group, other apps filter their own children.
+        """
+        for key, child in self.children._get_lazy().items():
+            if child is self:
+                continue
+            if child.is_wrapp:
+                if (include is None or key in wrap(include)) and (exclude is None or key not in wrap(exclude)):
+                    yield key, child, {}
+            else:
+                yield key, child, {'include': include, 'exclude': exclude}
+
+    def _get_pending(self, name, include=None, exclude=None):
+        """
+        Answers get for an unmaterialized WrApp from buffered settings and defaults, None if unknown.
+        """
+        if not isinstance(self, WrApp):
+            return None
+        if (include is not None and self.name not in wrap(include)) or (exclude is not None and self.name in wrap(exclude)):
+            return {}
+        for _, _, kws in reversed(self._lazy_sets):
+            if name in kws:
+                return {self.name: kws[name]}
+        if name in self.defaults:
+            return {self.name: self.defaults[name]}
+        return None
 
     def get1(self, name, include=None, exclude=None, skip_children=False, children_only=False):
         if name in self.trait_names:
@@ -319,13 +868,113 @@ class App:
         return unwrap(d)
 
     def set(self, include=None, exclude=None, **kwargs):
+        values = {}
         for name, value in kwargs.items():
             if name in self.trait_names:
                 setattr(self, name, value)
             else:
-                wridgets = self.wridgets(include=include, exclude=exclude)
-                for wridget in wridgets.values():
-                    wridget.set({name: value})
+                values[name] = value
+        if not values:
+            return
+        if self._lazy_kwargs is not None:
+            self._lazy_sets.append((include, exclude, values))
+        else:
+            # one call per wridget so its changed traits go out in one message, unchanged ones are skipped
+            for wridget in self.wridgets(include=include, exclude=exclude).values():
+                wridget.set(values)
+            for _, child, filters in self._lazy_children(include=include, exclude=exclude):
+                child.set(**filters, **values)
+
+    @property
+    def sync_stats(self):
+        """
+        Trait writes sent and suppressed as unchanged by set, summed over the child wridgets.
+        """
+        stats = {'writes': 0, 'suppressed': 0}
+        for wridget in self.wridgets().values():
+            for key in stats:
+                stats[key] += wridget.sync_stats[key]
+        return stats
+
+    def snapshot(self, to_json=False):
+        """
+        Captures the value of every child wridget in one pass.
+
+        Selection widgets are captured by index, other input widgets by value, both in their JSON form. Display 
+        widgets like Label or HTML are skipped. Composed apps that are not WrApps snapshot themselves, under 
+        'apps', so their own _snapshot decides what is state. Lazy apps that are not materialized yet are 
+        skipped, since they only hold their defaults and buffered settings.
+
+        :param to_json: (bool) return a JSON string instead of a dict
+
+        :returns: (dict or str) versioned state for restore
+        """
+        state = self._snapshot()
+        return json.dumps(state, separators=(',', ':')) if to_json else state
+
+    def _snapshot(self):
+        state = {'version': SNAPSHOT_VERSION, 'value': {}, 'index': {}}
+        composed = dict(self._composed_apps())
+        # the wridgets of composed apps are captured by those apps
+        owned = {id(wrapp) for app in composed.values() for wrapp in app.children._get_wrapps().values()}
+        for name, wrapp in self.children._get_wrapps().items():
+            widget = wrapp.wridget.widget
+            if id(wrapp) in owned or not _is_input(widget):
+                continue
+            key = 'index' if 'index' in widget.keys else 'value'
+            state[key][name] = widget.get_state(key)[key]
+        apps = {key: app._snapshot() for key, app in composed.items() if app.is_materialized}
+        if apps:
+            state['apps'] = apps
+        return state
+
+    def _composed_apps(self):
+        """
+        Yields key, app for the apps composed into this one, through its core or stacks, that are not WrApps.
+
+        Anonymous stacks are looked through. Keys are app names, suffixed like AppGroup names when repeated.
+        """
+        counts = {}
+        for app in self._walk_composed():
+            counts[app.name] = counts.get(app.name, 0) + 1
+            yield app.name + (str(counts[app.name]) if counts[app.name] > 1 else ''), app
+
+    def _walk_composed(self):
+        for app in [self.core] if self.core is not None else self._stack_members:
+            if app is None or app.is_wrapp:
+                continue
+            if type(app) is App:
+                yield from app._walk_composed()
+            else:
+                yield app
+
+    def restore(self, state):
+        """
+        Restores a snapshot with widget syncs held and a single build. Names missing from this app are ignored.
+
+        :param state: (dict or str) result of snapshot
+        """
+        state = json.loads(state) if isinstance(state, str) else state
+        assert state.get('version') == SNAPSHOT_VERSION, f"snapshot version {state.get('version')} is not {SNAPSHOT_VERSION}"
+        self.materialize()
+        with self.batch():
+            self._restore(state)
+
+    def _restore(self, state):
+        wrapps = self.children._get_wrapps()
+        for key in ('value', 'index'):
+            for name, value in state[key].items():
+                wrapp = wrapps.get(name)
+                if wrapp is not None:
+                    widget = wrapp.wridget.widget
+                    from_json = widget.trait_metadata(key, 'from_json', widget._trait_from_json)
+                    wrapp.wridget.set({key: from_json(value, widget)})
+        composed = dict(self._composed_apps())
+        for key, app_state in state.get('apps', {}).items():
+            app = composed.get(key)
+            if app is not None:
+                app.materialize()
+                app._restore(app_state)
     
     @property
     def ch(self):
@@ -349,7 +998,9 @@ class App:
     def reset(self):
         child_to_reset = []
         for _, child in self.children:
-            if child.is_wrapp:
+            if child._lazy_kwargs is not None:
+                child._lazy_sets.clear()
+            elif child.is_wrapp:
                 child_to_reset.append(child)
         for child in child_to_reset:
             child.set_trait_defaults(build=False)
@@ -357,8 +1008,77 @@ class App:
         self.set_trait_defaults()
 
 
+App._init_class()
+
+SNAPSHOT_VERSION = 1
+
+def _is_input(widget):
+    """
+    True if widget holds user input, i.e. is a value widget that is not display only.
+    """
+    return isinstance(widget, ipywidgets.ValueWidget) and not isinstance(widget, _display_widgets)
+
+
+_display_widgets = (
+    ipywidgets.Label, ipywidgets.HTML, ipywidgets.HTMLMath, ipywidgets.Valid, ipywidgets.FloatProgress, ipywidgets.IntProgress,
+)
+
+# bumped when an app's model_id changes in place, so parents rehash instead of extending a stale digest
+_model_id_epoch = 0
+
+
+def _invalidate_model_ids():
+    global _model_id_epoch
+    _model_id_epoch += 1
+
+
+def model_report():
+    """
+    Counts the open widget models owned by live apps per App class, to find leaks in long running sessions.
+
+    :returns: (dict) total open models, models owned by no live app, and apps and models per App class, most models first
+    """
+    owners = {}
+    per_class = {}
+    for app in list(App._instances):
+        models = [
+            model for widget in app._own_widgets() for model in widget_models(widget)
+            if model.comm is not None and id(model) not in owners
+        ]
+        owners.update({id(widget): app for widget in models})
+        if models:
+            counts = per_class.setdefault(type(app).__name__, {'apps': 0, 'models': 0})
+            counts['apps'] += 1
+            counts['models'] += len(models)
+    live = _live_widgets()
+    return {
+        'total': len(live),
+        'unattributed': sum(1 for widget in live if id(widget) not in owners),
+        'apps': dict(sorted(per_class.items(), key=lambda item: -item[1]['models'])),
+    }
+
+
+def _live_widgets():
+    instances = getattr(ipywidgets.widgets.widget, '_instances', None)
+    if instances is None:
+        instances = ipywidgets.Widget.widgets
+    return [widget for widget in list(instances.values()) if widget.comm is not None]
+
+
 class AppGroup:
+    # indexes live in slots so they stay out of __dict__, which holds the children,
+    # and helpers are underscored so they do not take names from children
+    __slots__ = ('__dict__', '_counters', '_wrapps', '_lazy', '_types', '_selections', '_digest', '_n_hashed', '_epoch')
+
     def __init__(self, *args, **kwargs):
+        object.__setattr__(self, '_counters', {})
+        object.__setattr__(self, '_wrapps', {})
+        object.__setattr__(self, '_lazy', {})
+        object.__setattr__(self, '_types', {})
+        object.__setattr__(self, '_selections', {})
+        object.__setattr__(self, '_digest', None)
+        object.__setattr__(self, '_n_hashed', 0)
+        object.__setattr__(self, '_epoch', _model_id_epoch)
         for value in args:
             self.__setattr__(value.name, value)
             
@@ -373,7 +1093,9 @@ class AppGroup:
             if original is not None:
                 original_model_id = getattr(original, 'model_id', None)
                 if original_model_id is not None and original_model_id == new_model_id:
+                    self._unindex(name)
                     self.__dict__[name] = value
+                    self._index(name, value)
                 else:
                     cont = True
             else:
@@ -382,18 +1104,142 @@ class AppGroup:
             cont = True
 
         if cont:
-            i = 1
             base = name
-            while hasattr(self, name):
-                i += 1
-                name = base
-                name += str(i)
+            if hasattr(self, name):
+                # resume from the last suffix used for this base instead of probing from 2
+                i = self._counters.get(base, 1)
+                while hasattr(self, name):
+                    i += 1
+                    name = base + str(i)
+                self._counters[base] = i
             # if getattr(value, 'name', name) != name:
             #     value.set_config(name=name, update=True)
             self.__dict__[name] = value
+            self._index(name, value)
+
+    def __delattr__(self, name):
+        if name not in self.__dict__:
+            raise AttributeError(name)
+        self._unindex(name)
+        del self.__dict__[name]
+        # freed names may be reused so probe from the start next time
+        self._counters.clear()
+
+    def _index(self, name, value):
+        if getattr(value, '_lazy_kwargs', None) is not None:
+            self._lazy[name] = value
+        elif isinstance(value, WrApp):
+            self._wrapps[name] = value
+        self._types.setdefault(type(value), {})[name] = value
+        self._selections.clear()
+
+    def _unindex(self, name):
+        # only appends can extend the running digest
+        object.__setattr__(self, '_digest', None)
+        value = self.__dict__.get(name)
+        self._wrapps.pop(name, None)
+        self._lazy.pop(name, None)
+        names = self._types.get(type(value))
+        if names is not None:
+            names.pop(name, None)
+            if not names:
+                del self._types[type(value)]
+        self._selections.clear()
     
     def __iter__(self):
         yield from self.__dict__.items()
+
+    def _copy(self):
+        obj = AppGroup()
+        obj.__dict__.update(self.__dict__)
+        obj._counters.update(self._counters)
+        obj._wrapps.update(self._wrapps)
+        obj._lazy.update(self._lazy)
+        obj._types.update({cls: dict(names) for cls, names in self._types.items()})
+        if self._digest is not None:
+            object.__setattr__(obj, '_digest', self._digest.copy())
+            object.__setattr__(obj, '_n_hashed', self._n_hashed)
+            object.__setattr__(obj, '_epoch', self._epoch)
+        return obj
+
+    def _hexdigest(self):
+        """
+        Returns the md5 hexdigest of the concatenated model ids of the children. 
+        
+        The hash is kept running so appended children are hashed once, and is only recomputed after a delete or overwrite, 
+        or after any app's model_id changed in place (reset, materialize).
+        """
+        if self._digest is None or self._epoch != _model_id_epoch:
+            object.__setattr__(self, '_digest', md5())
+            object.__setattr__(self, '_n_hashed', 0)
+            object.__setattr__(self, '_epoch', _model_id_epoch)
+        values = list(self.__dict__.values())
+        ids = []
+        for value in values[self._n_hashed:]:
+            model_id = getattr(value, 'model_id', None)
+            model_id = value.wridget.widget.model_id if model_id is None else model_id
+            ids.append(model_id)
+        self._digest.update(''.join(ids).encode())
+        object.__setattr__(self, '_n_hashed', len(values))
+        return self._digest.hexdigest()
+
+    def _get_wrapps(self):
+        """
+        Returns the WrApp children by name. The returned dict must not be modified.
+        """
+        if self._lazy:
+            self._promote()
+        return self._wrapps
+
+    def _get_lazy(self):
+        """
+        Returns the lazy apps that were added before materializing by name. 
+        
+        WrApps move to wrapps once materialized, other apps stay so get and set can reach their children.
+        """
+        if self._lazy:
+            self._promote()
+        return self._lazy
+
+    def _promote(self):
+        for name, value in list(self._lazy.items()):
+            if value._lazy_kwargs is None and isinstance(value, WrApp):
+                del self._lazy[name]
+                self._wrapps[name] = value
+                self._selections.clear()
+
+    def _of_type(self, cls):
+        """
+        Returns the children that are instances of cls by name, in insertion order.
+
+        :param cls: (type or tuple of types) e.g. Field or (Select, Buttons)
+        """
+        names = set()
+        for child_type, children in self._types.items():
+            if issubclass(child_type, cls):
+                names.update(children)
+        return {name: value for name, value in self if name in names}
+
+    def _select(self, include=None, exclude=None):
+        """
+        Returns the names of WrApp children filtered by include / exclude, cached until the group changes.
+        """
+        key = (
+            None if include is None else tuple(wrap(include)), 
+            None if exclude is None else tuple(wrap(exclude))
+        )
+        if self._lazy:
+            self._promote()
+        names = self._selections.get(key)
+        if names is None:
+            subset = self._wrapps.keys()
+            if include is not None:
+                subset = subset & set(key[0])
+            if exclude is not None:
+                subset = self._wrapps.keys() - set(key[1])
+            names = [name for name, _ in self if name in subset]
+            self._selections[key] = names
+        return names
         
     def __add__(self, other):
         if isinstance(other, AppGroup):
@@ -411,6 +1257,18 @@ class AppGroup:
 
 class WrApp:
     is_wrapp = True
+
+    def close(self):
+        if not self._closed and hasattr(self, 'wridget'):
+            self.wridget.close()
+        super().close()
+
+    def _own_widgets(self):
+        if hasattr(self, 'wridget'):
+            yield from self.wridget._own_widgets()
+        yield from super()._own_widgets()
+
+    @App.no_output
     def _set_wridget(self, wridget_type, **kwargs):
         if hasattr(self, 'allowed_wridget_types'):
             assert wridget_type in self.allowed_wridget_types, f'Allowed types are {self.allowed_wridget_types}'
@@ -419,7 +1277,11 @@ class WrApp:
         except:
             pass
         setattr(self.children, self.name, self)
-        self.wridget = getattr(wridgets, wridget_type)(output=self.output, **kwargs)
+        if hasattr(self, 'wridget'):
+            _invalidate_model_ids()
+        # compact apps make their Output on first use, or get the one of their root
+        output = self._config.get('output') if self.compact else self.output
+        self.wridget = getattr(wridgets, wridget_type)(output=output, **kwargs)
         self._app_layout = [
                 [
                     self.wridget.widget
@@ -433,15 +1295,32 @@ def _make(self, **kwargs):
     self._set_wridget(wridget_type=self.wridget_type, **kwargs)    
 
 
-def _initialize_default_apps():
-    for wridget in wridgets.wridget_list:
-        globals()[wridget] = type(wridget, (WrApp, App), {
-            "wridget_type": wridget,
-            "make": _make,
-        })
+def _make_default_app(name):
+    return type(name, (WrApp, App), {
+        "wridget_type": name,
+        "make": _make,
+    })
+
+
+def __getattr__(name):
+    # default apps without a custom class below are generated on first access to keep import fast
+    if name in wridgets.wridget_list:
+        globals()[name] = _make_default_app(name)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-_initialize_default_apps()
+def __dir__():
+    return sorted(set(globals()) | set(wridgets.wridget_list))
+
+
+# star imports go through __getattr__ for the default apps
+__all__ = [
+    'HBox', 'Output', 'VBox', 'display', 'unwrap', 'wrap', 'wridgets',
+    'App', 'AppGroup', 'WrApp', 'SNAPSHOT_VERSION', 'model_report',
+    'Buttons', 'Field', 'HTMLink', 'Tags', 'Container', 'VirtualSelect', 'Autocomplete', 'Pages', 'Tab', 'Accordion', 'LogView',
+    *wridgets.wridget_list,
+]
 
 # CUSTOM APPS
 
@@ -574,3 +1453,425 @@ class Container(WrApp, App):
             self.container.clear_output()
             if self.contents is not None:
                 display(self.contents)
+
+    def _own_widgets(self):
+        if isinstance(self.container, ipywidgets.Widget):
+            yield self.container
+        yield from super()._own_widgets()
+
+
+class VirtualSelect(App):
+    """
+    Select over a large option list that only sends one page of options to the frontend.
+
+    The full option list stays in the kernel in an OptionIndex. The search field filters it by prefix or
+    substring, and the Prev / Next buttons page through the matches. The selected option is kept at the
+    top of every page, so its value stays readable through App.get('value').
+    """
+    def make(self, options=(), value=None, page_size=50, search_mode='substring', debounce_ms=150, **kwargs):
+        self.page_size = page_size
+        self.search_mode = search_mode
+        self.index = OptionIndex(options)
+        self._matches = list(range(len(self.index)))
+        self._page = 0
+        self._selected = None
+        self._updating = False
+        kwargs.setdefault('rows', min(page_size, 10))
+        self._search = Field(name='Search', placeholder='Search', continuous_update=True, debounce_ms=debounce_ms, on_interact=self.search, output=self.output)
+        self._options = Select(name='Options', options=(), value=None, **kwargs)
+        self._page_label = Label(name='Page', fontsize=0)
+        self.core = (
+            self._search
+            - self._options
+            - (
+                Button(name='Prev', description='Prev', on_interact=self.prev_page, output=self.output)
+                + self._page_label
+                + Button(name='Next', description='Next', on_interact=self.next_page, output=self.output)
+            )
+        )
+        self._options.wridget.widget.observe(self._on_select, names='value')
+        self._show_page()
+        if value is not None:
+            self.select(value)
+
+    @property
+    def value(self):
+        return self.index.values[self._selected] if self._selected is not None else None
+
+    @property
+    def n_pages(self):
+        return max(-(-len(self._matches) // self.page_size), 1)
+
+    def set(self, include=None, exclude=None, **kwargs):
+        if include is None and exclude is None:
+            if 'options' in kwargs:
+                self.set_options(kwargs.pop('options'))
+            if 'value' in kwargs:
+                self.select(kwargs.pop('value'))
+        super().set(include=include, exclude=exclude, **kwargs)
+
+    def set_options(self, options):
+        self.index = OptionIndex(options)
+        self._selected = None
+        self.search()
+
+    def select(self, value):
+        """
+        Selects the option with value, whether or not it is on the current page.
+        """
+        position = self.index.position(value) if value is not None else None
+        assert value is None or position is not None, f'{value} is not an option'
+        self._selected = position
+        self._show_page()
+
+    def search(self):
+        self._matches = self.index.search(self._search.wridget.widget.value, mode=self.search_mode)
+        self._page = 0
+        self._show_page()
+
+    def next_page(self):
+        self.show_page(self._page + 1)
+
+    def prev_page(self):
+        self.show_page(self._page - 1)
+
+    def show_page(self, page):
+        self._page = min(max(page, 0), self.n_pages - 1)
+        self._show_page()
+
+    def _show_page(self):
+        start = self._page * self.page_size
+        positions = self._matches[start: start + self.page_size]
+        if self._selected is not None and self._selected not in positions:
+            positions = [self._selected] + positions
+        widget = self._options.wridget.widget
+        self._updating = True
+        try:
+            with widget.hold_sync():
+                widget.options = [self.index.option(i) for i in positions]
+                widget.value = self.value
+        finally:
+            self._updating = False
+        stop = min(start + self.page_size, len(self._matches))
+        self._page_label.set(value=f"<font size='+0'>{start + 1 if stop else 0}-{stop} of {len(self._matches)}</font>")
+
+    def _snapshot(self):
+        # the page options are derived, the selection is kept as its position in the index
+        state = super()._snapshot()
+        state['index'].pop('Options', None)
+        state['selected'] = self._selected
+        return state
+
+    def _restore(self, state):
+        super()._restore(state)
+        self._matches = self.index.search(self._search.wridget.widget.value, mode=self.search_mode)
+        self._page = 0
+        self._selected = state.get('selected')
+        self._show_page()
+
+    def _on_select(self, change):
+        if not self._updating:
+            index = self._options.wridget.widget.index
+            if index is not None:
+                label, value = self._options.wridget.widget.options[index]
+                self._selected = self.index.position(value)
+            else:
+                self._selected = None
+
+
+class Autocomplete(WrApp, App):
+    """
+    Combobox that suggests the top_k options matching what has been typed so far.
+
+    Matches come from an OptionIndex. When the query extends the previous one, only the previous matches are filtered.
+    """
+    def make(self, options=(), mode='prefix', top_k=10, **kwargs):
+        assert mode in OptionIndex.modes, f'mode must be one of {OptionIndex.modes}'
+        self.index = OptionIndex(options)
+        self.mode = mode
+        self.top_k = top_k
+        self._query = None
+        self._matches = None
+        kwargs.setdefault('continuous_update', True)
+        kwargs.setdefault('ensure_option', False)
+        kwargs.setdefault('layout', {'width': 'auto'})
+        self._set_wridget(wridget_type='Combobox', **kwargs)
+        self.wridget.widget.observe(self._on_query, names='value')
+        self.suggest(self.wridget.widget.value)
+
+    def set_options(self, options):
+        self.index = OptionIndex(options)
+        self._query = None
+        self._matches = None
+        self.suggest(self.wridget.widget.value)
+
+    def suggest(self, query):
+        """
+        Pushes the top_k options matching query to the Combobox options.
+        """
+        query = query or ''
+        within = self._matches if self._query is not None and query.lower().startswith(self._query.lower()) else None
+        self._matches = self.index.search(query, mode=self.mode, within=within)
+        self._query = query
+        top = self._matches[:self.top_k] if self.mode == 'prefix' else self.index.rank(query, self._matches, self.top_k)
+        options = tuple(self.index.labels[i] for i in top)
+        if options != self.wridget.widget.options:
+            self.wridget.widget.options = options
+
+    def _on_query(self, change):
+        self.suggest(change['new'])
+
+
+class Pages(App):
+    """
+    Composes apps as pages of a Tab or Accordion widget, building each page on first selection.
+
+    A page is an App or a function returning an App. Functions are only called when their page is first selected,
+    so their widgets and callbacks do not exist before. Pages made by functions are evicted least recently selected
+    first once more than max_live are built, closing their widgets, and rebuilt when selected again.
+
+    Usage:
+        app.Tab(pages=[app.Field(), lambda: Plot()], titles=['Field', 'Plot'], max_live=4)
+    """
+    container_type = 'Tab'
+
+    def make(self, pages=(), titles=None, max_live=None, **kwargs):
+        assert max_live is None or max_live >= 1, 'max_live must be at least 1'
+        self.max_live = max_live
+        self._pages = []
+        self._live = OrderedDict()
+        self._names = {}
+        self.container = getattr(ipywidgets, self.container_type)(**kwargs)
+        self._app_layout = [[self.container]]
+        titles = [None] * len(pages) if titles is None else titles
+        assert len(titles) == len(pages), 'titles must match pages'
+        for page, title in zip(pages, titles):
+            self.add_page(page, title=title)
+        self.container.observe(self._on_selected, names='selected_index')
+        self.show_page(self.container.selected_index)
+
+    @property
+    def live_pages(self):
+        """
+        Indices of built pages, least recently selected first.
+        """
+        return list(self._live)
+
+    def add_page(self, page, title=None):
+        """
+        :param page: (App or callable) App, or function returning an App, built on first selection
+        :param title: (str) page title, defaults to the App name or function name
+        """
+        index = len(self._pages)
+        self._pages.append(page)
+        if title is None:
+            title = page.name if isinstance(page, App) else getattr(page, '__name__', str(index))
+        with self.container.hold_sync():
+            self.container.children = self.container.children + (VBox(),)
+            self.container.set_title(index, title)
+        if isinstance(page, App):
+            # apps given as is are composed right away like + and -, materializing lazy ones on selection
+            self._add_children(index, page)
+        return index
+
+    def page(self, index):
+        """
+        Returns the App of page index, building it if needed.
+        """
+        self.show_page(index)
+        return self._live[index]
+
+    def show_page(self, index):
+        if index is None:
+            return
+        if index not in self._live:
+            page = self._pages[index]
+            page = page() if not isinstance(page, App) else page
+            page.materialize()
+            if not isinstance(self._pages[index], App):
+                self._add_children(index, page)
+            self.container.children[index].children = (page.app,)
+            self._live[index] = page
+        self._live.move_to_end(index)
+        self._evict()
+
+    def _evict(self):
+        if self.max_live is None:
+            return
+        evictable = [index for index in self._live if not isinstance(self._pages[index], App)]
+        while len(self._live) > self.max_live and len(evictable) > 1:
+            index = evictable.pop(0)
+            page = self._live.pop(index)
+            for name in self._names.pop(index, ()):
+                delattr(self.children, name)
+            self.container.children[index].children = ()
+            page.close()
+
+    def _add_children(self, index, page):
+        before = set(self.children.__dict__)
+        for name, value in page.children:
+            setattr(self.children, name, value)
+        if page.propagate:
+            setattr(self.children, page.name, page)
+        self._names[index] = [name for name in self.children.__dict__ if name not in before]
+
+    def _on_selected(self, change):
+        self.show_page(change['new'])
+
+    def close(self):
+        if not self._closed and self.is_materialized:
+            for page in list(self._live.values()) + [page for page in self._pages if isinstance(page, App)]:
+                page.close()
+        super().close()
+
+    def _own_widgets(self):
+        if self.is_materialized:
+            yield from self.container.children
+            yield self.container
+        yield from super()._own_widgets()
+
+
+class Tab(Pages):
+    container_type = 'Tab'
+
+
+class Accordion(Pages):
+    container_type = 'Accordion'
+
+
+class LogView(Container):
+    """
+    Append only log that keeps the last max_lines lines in a ring buffer.
+
+    Lines are batched and flushed at most fps times per second, and each flush prints only the new lines into 
+    the Output. Once the Output holds 2 * max_lines lines it is cleared and reprinted from the buffer, so the 
+    cost per line stays constant however many lines are logged. log and write can be called from any thread, 
+    frames and flushes run on the event loop the LogView was made on.
+
+    Usage:
+        log = app.LogView(max_lines=500)
+        log.log('step 1 done')
+        print('step 2 done', file=log)
+    """
+    def make(self, max_lines=1000, fps=10, height='300px', **kwargs):
+        assert max_lines >= 1, 'max_lines must be at least 1'
+        assert fps > 0, 'fps must be > 0'
+        self.max_lines = max_lines
+        self.fps = fps
+        self.lines = deque(maxlen=max_lines)
+        self._pending = deque(maxlen=max_lines)
+        self._partial = ''
+        self._lock = threading.Lock()
+        self._timer = None
+        # numbers scheduled frames, a frame that is not the latest one does nothing
+        self._frame = 0
+        self._n_shown = 0
+        # the kernel loop, output is only printed from its thread
+        self._loop = running_loop()
+        self.log_stats = {'lines': 0, 'dropped': 0, 'flushes': 0, 'compactions': 0}
+        kwargs.setdefault('container', Output(layout={'max_height': height, 'overflow': 'auto'}))
+        super().make(**kwargs)
+
+    @App.no_output
+    def log(self, *lines):
+        """
+        Appends lines, each argument may hold several lines separated by newlines.
+        """
+        lines = [line for text in lines for line in str(text).split('\n')]
+        with self._lock:
+            # lines that would be evicted before the next flush are never sent
+            self.log_stats['dropped'] += max(len(self._pending) + len(lines) - self.max_lines, 0)
+            self.log_stats['lines'] += len(lines)
+            self.lines.extend(lines)
+            self._pending.extend(lines)
+            if self._timer is None:
+                self._frame += 1
+                self._timer = self._schedule_frame(self._frame)
+
+    @App.no_output
+    def write(self, text):
+        """
+        File-like write so print(..., file=logview) works, lines are logged once complete.
+        """
+        with self._lock:
+            *lines, self._partial = (self._partial + text).split('\n')
+        if lines:
+            self.log(*lines)
+        return len(text)
+
+    @App.no_output
+    def flush(self):
+        """
+        Prints pending lines now instead of at the next frame.
+        """
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+            timer, self._timer = self._timer, None
+            if batch:
+                compact = self._n_shown + len(batch) > 2 * self.max_lines
+                if compact:
+                    batch = list(self.lines)
+                    self._n_shown = 0
+                self._n_shown += len(batch)
+                self.log_stats['flushes'] += 1
+                self.log_stats['compactions'] += compact
+        if timer is not None:
+            timer.cancel()
+        if batch:
+            self._call_on_loop(self._show, batch, compact)
+
+    @App.no_output
+    def _show(self, batch, compact):
+        if self._closed:
+            return
+        with self.container:
+            if compact:
+                self.container.clear_output(wait=True)
+            print('\n'.join(batch))
+
+    @App.no_output
+    def _schedule_frame(self, frame):
+        on_frame = functools.partial(self._on_frame, frame)
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return wridgets._call_later(1 / self.fps, on_frame)
+        if loop is running_loop():
+            return loop.call_later(1 / self.fps, on_frame)
+        # call_later is not thread safe, so a frame logged from another thread is scheduled from the loop.
+        # cancelling the returned handle only stops it before then, later the frame number tells it is stale
+        return loop.call_soon_threadsafe(loop.call_later, 1 / self.fps, on_frame)
+
+    @App.no_output
+    def _call_on_loop(self, func, *args):
+        loop = self._loop
+        if loop is None or loop.is_closed() or loop is running_loop():
+            func(*args)
+        else:
+            loop.call_soon_threadsafe(func, *args)
+
+    @App.no_output
+    def _on_frame(self, frame):
+        with self._lock:
+            if frame != self._frame or self._timer is None:
+                # a newer frame is scheduled, or flush or close took this one
+                return
+            self._timer = None
+        if not self._closed:
+            self.flush()
+
+    @App.no_output
+    def clear(self):
+        with self._lock:
+            self.lines.clear()
+            self._pending.clear()
+            self._partial = ''
+            self._n_shown = 0
+        self._call_on_loop(self.container.clear_output)
+
+    def close(self):
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        super().close()
@@ -0,0 +1,93 @@
+from collections import OrderedDict
+from hashlib import md5
+
+
+def state_key(*state):
+    """
+    Hashes widget state into a cache key.
+
+    :param state: values to hash, e.g. Wridget.get('value') or App.get('value')
+
+    :returns: (str) md5 hexdigest of the repr of state
+    """
+    return md5(repr(state).encode()).hexdigest()
+
+
+def sizeof_outputs(outputs):
+    """
+    Estimates the bytes held by Output widget outputs, dominated by their display data strings.
+    """
+    if isinstance(outputs, (str, bytes)):
+        return len(outputs)
+    if isinstance(outputs, dict):
+        return sum(len(k) + sizeof_outputs(v) for k, v in outputs.items())
+    if isinstance(outputs, (list, tuple)):
+        return sum(sizeof_outputs(v) for v in outputs)
+    return 8
+
+
+class OutputCache:
+    """
+    LRU cache of captured Output widget outputs keyed on widget state.
+
+    :param maxsize: (int) max number of entries
+    :param max_bytes: (int) max estimated bytes of all entries. None for no budget
+    """
+    def __init__(self, maxsize=128, max_bytes=None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    def get(self, key):
+        """
+        Returns the outputs stored under key, or None on a miss.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats['hits'] += 1
+        return entry[0]
+
+    def put(self, key, outputs):
+        outputs = tuple(outputs)
+        nbytes = sizeof_outputs(outputs)
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            return
+        self.pop(key)
+        self._entries[key] = (outputs, nbytes)
+        self._nbytes += nbytes
+        self._evict()
+
+    def pop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._nbytes -= entry[1]
+
+    def resize(self, maxsize=None, max_bytes=None):
+        self.maxsize = maxsize if maxsize is not None else self.maxsize
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def clear(self):
+        self._entries.clear()
+        self._nbytes = 0
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.maxsize
+            or (self.max_bytes is not None and self._nbytes > self.max_bytes)
+        ):
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self._nbytes -= nbytes
+            self.stats['evictions'] += 1
@@ -1,12 +1,348 @@
-from collections import namedtuple
+import io
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
-import matplotlib.pyplot as plt
+import ipywidgets
 
-from wridgets.app import Container
+from wridgets import wridgets
+from wridgets.app import App, Container
+from wridgets.utils import LazyModule, running_loop
+from wridgets.wridgets import _call_later
+
+# imported on first use so importing wridgets.plotting stays fast
+plt = LazyModule('matplotlib.pyplot')
+np = LazyModule('numpy')
 
 MPLEvent = namedtuple("MPLEvent", ["event_type", "on_event", "cid", "active"])
 
 
+class EventDispatcher:
+    """
+    Sits between matplotlib and event handlers. 
+    
+    Event types with a throttle are handled at most once per throttle_ms. Events arriving in between 
+    are queued and drained one per interval, or coalesced so that only the latest one is handled.
+    """
+    def __init__(self):
+        self.policies = {}
+        self.stats = {}
+        self._queues = {}
+        self._timers = {}
+        self._last = {}
+        self._lock = threading.RLock()
+
+    def set_policy(self, event_type, throttle_ms=None, coalesce=True, max_queue=100):
+        """
+        :param event_type: (str) matplotlib event type, e.g. 'motion_notify_event'
+        :param throttle_ms: (float) min time between handled events. None handles every event immediately
+        :param coalesce: (bool) only keep the latest event received while throttled
+        :param max_queue: (int) max events queued while throttled, oldest are dropped first. None for unbounded
+        """
+        with self._lock:
+            self.policies[event_type] = dict(throttle_ms=throttle_ms, coalesce=coalesce, max_queue=max_queue)
+            self._queues.pop(event_type, None)
+
+    def dispatch(self, event_type, on_event, event):
+        with self._lock:
+            stats = self.stats.setdefault(event_type, {'received': 0, 'handled': 0, 'dropped': 0})
+            stats['received'] += 1
+            policy = self.policies.get(event_type)
+            if policy is not None and policy['throttle_ms']:
+                throttle = policy['throttle_ms'] / 1000
+                elapsed = time.monotonic() - self._last.get(event_type, float('-inf'))
+                if self._timers.get(event_type) is not None or elapsed < throttle:
+                    if event_type not in self._queues:
+                        self._queues[event_type] = deque(maxlen=1 if policy['coalesce'] else policy['max_queue'])
+                    queue = self._queues[event_type]
+                    if queue.maxlen is not None and len(queue) == queue.maxlen:
+                        stats['dropped'] += 1
+                    queue.append((on_event, event))
+                    if self._timers.get(event_type) is None:
+                        self._timers[event_type] = _call_later(throttle - elapsed, partial(self._drain, event_type))
+                    return
+        self._handle(event_type, on_event, event)
+
+    def _drain(self, event_type):
+        with self._lock:
+            queue = self._queues.get(event_type)
+            if not queue:
+                self._timers[event_type] = None
+                return
+            on_event, event = queue.popleft()
+            policy = self.policies.get(event_type)
+            if queue and policy is not None and policy['throttle_ms']:
+                self._timers[event_type] = _call_later(policy['throttle_ms'] / 1000, partial(self._drain, event_type))
+            else:
+                self._timers[event_type] = None
+        self._handle(event_type, on_event, event)
+
+    def _handle(self, event_type, on_event, event):
+        with self._lock:
+            self._last[event_type] = time.monotonic()
+            self.stats[event_type]['handled'] += 1
+        on_event(event)
+
+    def reset(self):
+        """
+        Drops queued events and cancels pending drains.
+        """
+        with self._lock:
+            for timer in self._timers.values():
+                if timer is not None:
+                    timer.cancel()
+            for event_type, queue in self._queues.items():
+                self.stats[event_type]['dropped'] += len(queue)
+                queue.clear()
+            self._timers.clear()
+
+
+def minmax_decimate(x, y, n_out):
+    """
+    Keeps the min and max of y in each of n_out // 2 bins of equal point count.
+
+    :param x: (array) x values, sorted
+    :param y: (array) y values
+    :param n_out: (int) approximate number of points to return
+
+    :returns: (tuple) decimated x, y
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    idx = _minmax_indices(y, 0, len(y), n_out)
+    return x[idx], y[idx]
+
+
+def _minmax_indices(y, start, stop, n_out):
+    n = stop - start
+    if n <= n_out:
+        return np.arange(start, stop)
+    block = -(-n // max(n_out // 2, 1))
+    n_blocks = -(-n // block)
+    # pad with the last value so the remainder forms a final partial block
+    blocks = np.empty(n_blocks * block, dtype=y.dtype)
+    blocks[:n] = y[start:stop]
+    blocks[n:] = y[stop - 1]
+    blocks = blocks.reshape(n_blocks, block)
+    offsets = start + np.arange(n_blocks) * block
+    idx = np.concatenate([offsets + blocks.argmin(axis=1), offsets + blocks.argmax(axis=1), [start, stop - 1]])
+    return np.unique(np.minimum(idx, stop - 1))
+
+
+def lttb_decimate(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling. 
+    
+    Keeps the point of each bucket that forms the largest triangle with the point kept 
+    from the previous bucket and the mean of the next bucket. Loops over buckets, so cost is 
+    bounded by n_out iterations plus one vectorized pass over the data.
+
+    :param x: (array) x values, sorted
+    :param y: (array) y values
+    :param n_out: (int) number of points to return
+
+    :returns: (tuple) decimated x, y
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    idx = np.empty(n_out, dtype=int)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        next_lo = hi
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        next_hi = max(next_hi, next_lo + 1)
+        avg_x, avg_y = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        idx[i + 1] = a
+    return x[idx], y[idx]
+
+
+class Decimator:
+    """
+    View-aware decimation of a line with sorted x.
+
+    Precomputes a min/max pyramid so that decimating any visible range costs O(n_out), independent of the data size.
+
+    :param x: (array) x values, sorted
+    :param y: (array) y values
+    :param method: (str) 'minmax' or 'lttb'
+    :param base_block: (int) block size of the first pyramid level, as a power of 2. 
+        smaller ranges are decimated from the raw data
+    """
+    methods = 'minmax', 'lttb'
+
+    def __init__(self, x, y, method='minmax', base_block=4):
+        assert method in self.methods, f'method must be one of {self.methods}'
+        self.x, self.y = np.asarray(x), np.asarray(y)
+        self.method = method
+        self.base_block = base_block
+        self._levels = self._build_levels()
+
+    def _build_levels(self):
+        """
+        Returns {level: (argmin, argmax)} with raw indices of the min and max of y in each block of 2 ** level points.
+        """
+        y = self.y
+        n = len(y)
+        levels = {}
+        block = 2 ** self.base_block
+        if n <= block:
+            return levels
+        dtype = np.int32 if n < 2 ** 31 else np.int64
+        n_blocks = -(-n // block)
+        padded = np.empty(n_blocks * block, dtype=y.dtype)
+        padded[:n] = y
+        padded[n:] = y[-1]
+        padded = padded.reshape(n_blocks, block)
+        offsets = np.arange(n_blocks, dtype=dtype) * block
+        imin = np.minimum(offsets + padded.argmin(axis=1).astype(dtype), n - 1)
+        imax = np.minimum(offsets + padded.argmax(axis=1).astype(dtype), n - 1)
+        level = self.base_block
+        levels[level] = imin, imax
+        while len(imin) > 1:
+            if len(imin) % 2:
+                imin, imax = np.append(imin, imin[-1]), np.append(imax, imax[-1])
+            a, b = imin[0::2], imin[1::2]
+            imin = np.where(y[a] <= y[b], a, b)
+            a, b = imax[0::2], imax[1::2]
+            imax = np.where(y[a] >= y[b], a, b)
+            level += 1
+            levels[level] = imin, imax
+        return levels
+
+    def __call__(self, xmin, xmax, n_out):
+        """
+        Decimates the points within [xmin, xmax], plus one point on each side so lines reach the edges.
+
+        :returns: (tuple) decimated x, y
+        """
+        n = len(self.x)
+        start = max(int(np.searchsorted(self.x, xmin, side='left')) - 1, 0)
+        stop = min(int(np.searchsorted(self.x, xmax, side='right')) + 1, n)
+        if stop <= start:
+            return self.x[:0], self.y[:0]
+        # lttb selects from a min/max preselection a few times larger than its output
+        n_candidates = n_out if self.method == 'minmax' else 4 * n_out
+        idx = self._indices(start, stop, n_candidates)
+        x, y = self.x[idx], self.y[idx]
+        if self.method == 'lttb':
+            return lttb_decimate(x, y, n_out)
+        return x, y
+
+    def _indices(self, start, stop, n_out):
+        n_bins = max(n_out // 2, 1)
+        count = stop - start
+        level = int(np.ceil(np.log2(count / n_bins))) if count > n_bins else 0
+        if level < self.base_block or level not in self._levels:
+            return _minmax_indices(self.y, start, stop, n_out)
+        imin, imax = self._levels[level]
+        # the pyramid only covers whole blocks, the partial blocks at the edges are decimated from the raw data
+        lo, hi = -(-start >> level), stop >> level
+        if lo >= hi:
+            return _minmax_indices(self.y, start, stop, n_out)
+        edge_start, edge_stop = lo << level, hi << level
+        idx = np.concatenate([
+            _minmax_indices(self.y, start, edge_start, 2) if start < edge_start else [],
+            imin[lo:hi],
+            imax[lo:hi],
+            _minmax_indices(self.y, edge_stop, stop, 2) if edge_stop < stop else [],
+            [start, stop - 1],
+        ]).astype(imin.dtype)
+        return np.unique(idx)
+
+
+def render_figure(fig, fmt='png', **savefig_kws):
+    """
+    Renders a figure to image bytes, with the Agg backend for raster formats.
+
+    :param fig: (Figure) figure to render
+    :param fmt: (str) 'png' or 'svg'
+    :param savefig_kws: passed to fig.savefig
+
+    :returns: (bytes)
+    """
+    if fmt == 'png':
+        savefig_kws.setdefault('backend', 'agg')
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, **savefig_kws)
+    return buf.getvalue()
+
+
+_render_executor = None
+
+
+def _get_render_executor():
+    # one worker, since matplotlib rendering is not thread safe across figures sharing state
+    global _render_executor
+    if _render_executor is None:
+        _render_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='wridgets-render')
+    return _render_executor
+
+
+def _n_points(ax, points_per_pixel):
+    return max(int(ax.get_window_extent().width * points_per_pixel), 4)
+
+
+def _resize(fig, figsize=None, dpi=None, **kwargs):
+    if figsize is not None:
+        fig.set_size_inches(figsize)
+    if dpi is not None:
+        fig.set_dpi(dpi)
+
+
+class FigurePool:
+    """
+    Keeps released figures for reuse, so replacing a figure does not create and close one each time.
+    At most max_size figures are kept; extra released figures are closed, which bounds the pyplot figure manager.
+    """
+    def __init__(self, max_size=8):
+        self.max_size = max_size
+        self._free = deque()
+        self.stats = {'created': 0, 'reused': 0, 'closed': 0}
+
+    def acquire(self, **fig_kws):
+        if self._free:
+            fig = self._free.popleft()
+            _resize(fig, **fig_kws)
+            self.stats['reused'] += 1
+            return fig
+        self.stats['created'] += 1
+        return plt.figure(**fig_kws)
+
+    def release(self, fig):
+        fig.clear()
+        self._free.append(fig)
+        while len(self._free) > self.max_size:
+            plt.close(self._free.popleft())
+            self.stats['closed'] += 1
+
+    def clear(self):
+        while self._free:
+            plt.close(self._free.popleft())
+            self.stats['closed'] += 1
+
+    def memory(self):
+        """
+        Returns figure counts and the estimated bytes of pooled figure canvases (RGBA at figure dpi).
+        """
+        return dict(
+            self.stats,
+            pooled=len(self._free),
+            pooled_bytes=sum(int(fig.bbox.width) * int(fig.bbox.height) * 4 for fig in self._free),
+            pyplot_figures=len(plt.get_fignums()),
+        )
+
+
+figure_pool = FigurePool()
+
+
 class MPLFig(Container):
     _events = None
     event_types = [
@@ -25,12 +361,41 @@ class MPLFig(Container):
         "axes_leave_event",
         "close_event",
     ]
+    # dispatched by MPLFig itself rather than the canvas, can only be given a policy
+    axes_event_types = [
+        "xlim_changed",
+    ]
 
-    def make(self, fig=None, makefig=None, close_previous_figs=True, **kwargs):
-        super().make(contents=fig, **kwargs)
-        self._makefig = makefig
+    def make(self, fig=None, makefig=None, close_previous_figs=True, update=None, blit=True, event_policies=None, reuse_fig=False, render=None, render_kws=None, **kwargs):
+        assert render in (None, 'png', 'svg'), "render must be None, 'png' or 'svg'"
+        self.render = render
+        self.render_kws = render_kws if render_kws is not None else {}
+        self._render_lock = threading.Lock()
+        self._render_generation = 0
+        self._render_future = None
+        self._rendered = None
+        self.render_stats = {'requested': 0, 'rendered': 0, 'cached': 0, 'superseded': 0}
+        if render is not None:
+            # renders are pushed to an image instead of displaying the live figure
+            self.image = wridgets.Image(format='svg+xml' if render == 'svg' else 'png', layout={'width': 'auto'})
+            kwargs.setdefault('children', [self.image.widget])
+            blit = False
+        self.reuse_fig = reuse_fig
+        self._decimated = {}
+        self._artists = None
+        self._background = None
+        self._draw_cid = None
+        self.dispatcher = EventDispatcher()
+        for event_type, policy in (event_policies or {}).items():
+            self.set_event_policy(event_type, **policy)
+        self.blit = blit
+        self._update = update
+        fig, artists = fig if isinstance(fig, tuple) else (fig, None)
         self.close_previous_figs = close_previous_figs
         self._events = {}
+        super().make(contents=fig, **kwargs)
+        self.artists = artists
+        self._makefig = makefig
         if self.fig is not None:
             for event_type in self.event_types:
                 if event_type in kwargs:
@@ -43,37 +408,289 @@ class MPLFig(Container):
 
     @fig.setter
     def fig(self, fig):
+        if fig is not None and fig is self.contents:
+            # reused figure, the canvas and its event connections are unchanged
+            self._artists = None
+            self._decimated = {ax: lines for ax, lines in self._decimated.items() if ax in fig.axes}
+            self._background = None
+            self.dispatcher.reset()
+            self._request_draw()
+            return
+
         if self.close_previous_figs:
             if self.contents is not None:
-                plt.close(self.contents.number)
+                if self.reuse_fig:
+                    for event in self.events.values():
+                        if event.active:
+                            self.contents.canvas.mpl_disconnect(event.cid)
+                    old_fig = self.contents
+                    self.contents = None
+                    figure_pool.release(old_fig)
+                else:
+                    plt.close(self.contents.number)
 
         self.contents = fig
+        self.dispatcher.reset()
 
         for event in self.events.values():
             if event.active:
                 self.connect_event(event.event_type, event.on_event, overwrite=True)
 
+    @property
+    def contents(self):
+        return self._contents
+
+    @contents.setter
+    def contents(self, contents):
+        # artists belong to the previous figure
+        self._artists = None
+        # makefig registers decimated lines before the figure is assigned
+        self._decimated = {ax: lines for ax, lines in self._decimated.items() if contents is not None and ax in contents.axes}
+        self._background = None
+        if self._draw_cid is not None and self._contents is not None:
+            self._contents.canvas.mpl_disconnect(self._draw_cid)
+            self._draw_cid = None
+        if contents is not None:
+            self._draw_cid = contents.canvas.mpl_connect('draw_event', self._on_draw)
+        self._contents = contents
+        self._display_contents()
+
     @property
     def events(self):
         return self._events
 
+    @property
+    def artists(self):
+        return self._artists
+
+    @artists.setter
+    def artists(self, artists):
+        """
+        Artists returned by makefig alongside the figure, updated in place by update.
+        """
+        self._artists = artists
+        self._background = None
+        for artist in self._iter_artists():
+            artist.set_animated(self.blit)
+
+    @App.no_output
+    def _iter_artists(self):
+        if self.artists is None:
+            return []
+        return list(self.artists.values()) if isinstance(self.artists, dict) else list(self.artists)
+
     @staticmethod
     def makefig(self, *args, **kwargs):
-        self.fig = self._makefig(self, *args, **kwargs)
+        fig = self._makefig(self, *args, **kwargs)
+        self.fig, self.artists = fig if isinstance(fig, tuple) else (fig, None)
 
     def set_makefig(self, makefig):
         self._makefig = makefig
 
+    def figure(self, **fig_kws):
+        """
+        Returns a figure for makefig to draw into. 
+        
+        With reuse_fig, the current figure is cleared and returned, keeping its canvas and event connections,
+        or one is taken from figure_pool. Otherwise a new figure is created with plt.figure.
+
+        :param fig_kws: passed to plt.figure. figsize and dpi are applied to reused figures
+        """
+        if not self.reuse_fig:
+            return plt.figure(**fig_kws)
+        if self.fig is None:
+            return figure_pool.acquire(**fig_kws)
+        self.fig.clear()
+        _resize(self.fig, **fig_kws)
+        return self.fig
+
+    def subplots(self, nrows=1, ncols=1, fig_kws=None, **kwargs):
+        """
+        Like plt.subplots, but draws into MPLFig.figure.
+
+        Usage:
+            def makefig(self):
+                fig, ax = self.subplots()
+                ax.plot(...)
+                return fig
+        """
+        fig = self.figure(**(fig_kws or {}))
+        return fig, fig.subplots(nrows, ncols, **kwargs)
+
+    def set_update(self, update):
+        self._update = update
+
+    def update(self, *args, **kwargs):
+        """
+        Updates the figure in place with the update function, only redrawing its artists.
+        Falls back to makefig if there is no update function or makefig returned no artists.
+
+        update is called as update(self, artists, *args, **kwargs) and should only change artist data,
+        e.g. line.set_data or scatter.set_offsets. Without a widget canvas the figure is shown again, see redraw.
+        """
+        if self._update is None or self.fig is None or not self._iter_artists():
+            return self.makefig(*args, **kwargs)
+        self._update(self, self.artists, *args, **kwargs)
+        self.redraw()
+
+    @App.no_output
+    def redraw(self):
+        """
+        Redraws the artists, blitting them over the cached background when the canvas supports it.
+
+        Only widget canvases (ipympl, %matplotlib widget) redraw in place. Others, e.g. the inline backend, 
+        show the figure again.
+        """
+        if self.render is not None:
+            return self.request_render()
+        if not self._has_widget_canvas():
+            return self._display_contents()
+        canvas = self.fig.canvas
+        if not (self.blit and canvas.supports_blit and self._iter_artists()):
+            canvas.draw_idle()
+        elif self._background is None:
+            # the draw event captures the background and draws the artists
+            canvas.draw()
+        else:
+            canvas.restore_region(self._background)
+            self._draw_artists()
+            canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+
+    @App.no_output
+    def _draw_artists(self):
+        for artist in self._iter_artists():
+            self.fig.draw_artist(artist)
+
+    @App.no_output
+    def _on_draw(self, event):
+        # full draws exclude animated artists, so cache what is behind them and draw them on top
+        if self.blit and event is not None and event.canvas.supports_blit and self._iter_artists():
+            self._background = event.canvas.copy_from_bbox(self.fig.bbox)
+            self._draw_artists()
+
+    @App.no_output
+    def _request_draw(self):
+        if self.render is not None:
+            self.request_render()
+        elif self._has_widget_canvas():
+            self.fig.canvas.draw_idle()
+        else:
+            self._display_contents()
+
+    @App.no_output
+    def _has_widget_canvas(self):
+        # draw_idle only reaches the frontend through a widget canvas, other figures are static once shown
+        return isinstance(self.fig.canvas, ipywidgets.DOMWidget)
+
+    @App.no_output
     def _display_contents(self):
+        if self.render is not None:
+            return self.request_render()
         with self.container:
             self.container.clear_output()
             if self.fig is not None:
                 self.fig.show()
 
+    @App.no_output
+    def request_render(self):
+        """
+        Renders the figure to image bytes on a worker thread and pushes them to MPLFig.image.
+        
+        A newer request cancels or discards older in-flight renders. An unchanged figure reuses the last bytes, 
+        so every view of the image shares one render.
+        """
+        fig = self.fig
+        if fig is None:
+            return
+        with self._render_lock:
+            self.render_stats['requested'] += 1
+            if self._rendered is not None and self._rendered[0] is fig and not fig.stale:
+                self.render_stats['cached'] += 1
+                self.image.widget.value = self._rendered[1]
+                return
+            self._render_generation += 1
+            generation = self._render_generation
+            previous = self._render_future
+            if previous is not None and previous.cancel():
+                self.render_stats['superseded'] += 1
+            self._render_future = _get_render_executor().submit(render_figure, fig, self.render, **self.render_kws)
+            # the image and fig.stale are updated from the kernel thread
+            self._render_future.add_done_callback(partial(self._on_render_done, running_loop(), generation, fig))
+
+    @property
+    def rendered(self):
+        """
+        Bytes of the last completed render.
+        """
+        return self._rendered[1] if self._rendered is not None else None
+
+    @App.no_output
+    def _on_render_done(self, loop, generation, fig, future):
+        # runs on the render thread
+        if future.cancelled():
+            return
+        if loop is None or loop.is_closed() or loop is running_loop():
+            self._show_render(generation, fig, future)
+        else:
+            loop.call_soon_threadsafe(self._show_render, generation, fig, future)
+
+    @App.no_output
+    def _show_render(self, generation, fig, future):
+        with self._render_lock:
+            if generation != self._render_generation:
+                self.render_stats['superseded'] += 1
+                return
+            self.render_stats['rendered'] += 1
+            self._rendered = fig, future.result()
+            # savefig restores properties, which marks the figure stale. no newer request means nothing changed since
+            fig.stale = False
+        self.image.widget.value = self._rendered[1]
+
+    def plot_decimated(self, ax, x, y, method='minmax', points_per_pixel=2, **plot_kws):
+        """
+        Plots a line that is re-decimated to the visible x range whenever the axes xlim changes, 
+        so that drawing cost is bounded by the axes width in pixels rather than the data size.
+
+        xlim changes go through the event dispatcher as 'xlim_changed', so rapid zooming and panning 
+        can be throttled with set_event_policy('xlim_changed', throttle_ms=...).
+
+        :param ax: (Axes) axes of this figure to plot into
+        :param x: (array) x values, sorted
+        :param y: (array) y values
+        :param method: (str) 'minmax' or 'lttb'
+        :param points_per_pixel: (float) points kept per pixel of axes width
+        :param plot_kws: passed to ax.plot
+
+        :returns: Line2D
+        """
+        decimator = Decimator(x, y, method=method)
+        xmin, xmax = decimator.x[0], decimator.x[-1]
+        line, = ax.plot(*decimator(xmin, xmax, _n_points(ax, points_per_pixel)), **plot_kws)
+        if ax not in self._decimated:
+            self._decimated[ax] = []
+            ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+        self._decimated[ax].append((line, decimator, points_per_pixel))
+        return line
+
+    @App.no_output
+    def _on_xlim_changed(self, ax):
+        self.dispatcher.dispatch('xlim_changed', self._redecimate, ax)
+
+    @App.no_output
+    def _redecimate(self, ax):
+        lines = self._decimated.get(ax)
+        if not lines:
+            return
+        xmin, xmax = sorted(ax.get_xlim())
+        for line, decimator, points_per_pixel in lines:
+            line.set_data(*decimator(xmin, xmax, _n_points(ax, points_per_pixel)))
+        self._request_draw()
+
     def _validate_event_type(self, event_type):
         assert (
-            event_type in self.event_types
-        ), f"{event_type} not found. available types are {self.event_types}"
+            event_type in self.event_types + self.axes_event_types
+        ), f"{event_type} not found. available types are {self.event_types + self.axes_event_types}"
 
     def connect_event(self, event_type, on_event, overwrite=False):
         self._validate_event_type(event_type)
@@ -87,33 +704,83 @@ class MPLFig(Container):
                 old_event is None
             ), "Cannot overwrite previous event while overwrite = False"
 
-        cid = self.fig.canvas.mpl_connect(event_type, on_event)
+        cid = self.fig.canvas.mpl_connect(event_type, partial(self._on_event, event_type))
         event = MPLEvent(event_type=event_type, on_event=on_event, cid=cid, active=True)
         self.events.update({event_type: event})
 
+    @App.no_output
+    def _on_event(self, event_type, mpl_event):
+        # look the handler up at dispatch time so the event table stays authoritative
+        event = self.events.get(event_type)
+        if event is not None and event.active:
+            self.dispatcher.dispatch(event_type, event.on_event, mpl_event)
+
+    def set_event_policy(self, event_type, throttle_ms=None, coalesce=True, max_queue=100):
+        """
+        Throttles an event type, e.g. set_event_policy('motion_notify_event', throttle_ms=50).
+        See EventDispatcher.set_policy.
+        """
+        self._validate_event_type(event_type)
+        self.dispatcher.set_policy(event_type, throttle_ms=throttle_ms, coalesce=coalesce, max_queue=max_queue)
+
+    @property
+    def event_stats(self):
+        """
+        Received, handled and dropped counts per event type.
+        """
+        return self.dispatcher.stats
+
     def deactivate_event(self, event_type):
         event = self.events.get(event_type)
         assert event is not None, f"No event of type {event_type} to deactivate."
         self.fig.canvas.mpl_disconnect(event.cid)
-        event._replace(active=False)
+        self.events[event_type] = event._replace(active=False)
 
     def reactivate_event(self, event_type):
         event = self.events.get(event_type)
         assert event is not None, f"No event of type {event_type} to reactive."
-        cid = self.fig.canvas.mpl_connect(event.event_type, event.on_event)
-        event._replace(cid=cid)
-        event._replace(active=True)
+        cid = self.fig.canvas.mpl_connect(event.event_type, partial(self._on_event, event.event_type))
+        self.events[event_type] = event._replace(cid=cid, active=True)
 
     def delete_event(self, event_type):
         self.deactivate_event(event_type)
         self.events.pop(event_type)
 
+    def close(self):
+        """
+        Disconnects events, closes or pools the figure and closes the widgets.
+        """
+        if not self._closed and self.is_materialized:
+            self.dispatcher.reset()
+            with self._render_lock:
+                future, self._render_future = self._render_future, None
+            if future is not None:
+                future.cancel()
+            fig = self.fig
+            if fig is not None:
+                for event in self.events.values():
+                    if event.active:
+                        fig.canvas.mpl_disconnect(event.cid)
+                self.events.clear()
+                self.contents = None
+                if self.reuse_fig:
+                    figure_pool.release(fig)
+                else:
+                    plt.close(fig)
+            self._rendered = None
+        super().close()
+
+    def _own_widgets(self):
+        if self.is_materialized and self.render is not None:
+            yield from self.image._own_widgets()
+        yield from super()._own_widgets()
+
 
-def contain_fig(figtype):
+def contain_fig(figtype, update=None):
     def inner(func):
         def selection(*args, **kwargs):
             if figtype == "mpl":
-                return MPLFig(fig=func(*args, **kwargs), makefig=func)
+                return MPLFig(fig=func(*args, **kwargs), makefig=func, update=update)
 
         return selection
 
@@ -0,0 +1,148 @@
+import heapq
+from bisect import bisect_left
+
+
+class OptionIndex:
+    """
+    Case-insensitive index over option labels for fast filtering.
+
+    Prefix queries bisect a sorted copy of the labels, so they cost O(log n + k) for k matches. 
+    Substring queries of 3+ characters intersect trigram posting lists, built on first use, and only 
+    verify the surviving candidates. Fuzzy queries match labels containing the query characters in order,
+    narrowed first by per-character posting lists.
+
+    All queries accept `within`, the result of a previous query that this one extends, and then only 
+    filter those positions.
+
+    :param options: (iterable) labels, or (label, value) pairs like ipywidgets options
+    """
+    def __init__(self, options=()):
+        self.labels = []
+        self.values = []
+        for option in options:
+            label, value = option if isinstance(option, tuple) else (option, option)
+            self.labels.append(str(label))
+            self.values.append(value)
+        self._keys = [label.lower() for label in self.labels]
+        self._order = sorted(range(len(self._keys)), key=self._keys.__getitem__)
+        self._sorted_keys = [self._keys[i] for i in self._order]
+        self._positions = None
+        self._trigrams = None
+        self._chars = None
+
+    def __len__(self):
+        return len(self.labels)
+
+    def option(self, i):
+        return self.labels[i], self.values[i]
+
+    def position(self, value):
+        """
+        Returns the position of the first option with value, or None.
+        """
+        if self._positions is None:
+            self._positions = {}
+            for i, v in enumerate(self.values):
+                try:
+                    self._positions.setdefault(v, i)
+                except TypeError:
+                    pass
+        try:
+            return self._positions.get(value)
+        except TypeError:
+            return self.values.index(value) if value in self.values else None
+
+    def prefix(self, query, within=None):
+        """
+        Returns positions of options whose label starts with query, in label order.
+        """
+        query = query.lower()
+        if within is not None:
+            return [i for i in within if self._keys[i].startswith(query)]
+        start = bisect_left(self._sorted_keys, query)
+        # every key with the prefix sorts before query + the max code point
+        stop = bisect_left(self._sorted_keys, query + '\U0010ffff', lo=start)
+        return self._order[start:stop]
+
+    def substring(self, query, within=None):
+        """
+        Returns positions of options whose label contains query, in option order.
+        """
+        query = query.lower()
+        if within is not None:
+            return [i for i in within if query in self._keys[i]]
+        if not query:
+            return list(range(len(self)))
+        if len(query) < 3:
+            return [i for i, key in enumerate(self._keys) if query in key]
+        if self._trigrams is None:
+            self._build_trigrams()
+        postings = []
+        for j in range(len(query) - 2):
+            posting = self._trigrams.get(query[j:j + 3])
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+        return [i for i in sorted(candidates) if query in self._keys[i]]
+
+    def fuzzy(self, query, within=None):
+        """
+        Returns positions of options whose label contains the characters of query in order, in option order.
+        """
+        query = query.lower()
+        if within is None:
+            if not query:
+                return list(range(len(self)))
+            if self._chars is None:
+                self._build_chars()
+            postings = sorted((self._chars.get(c, ()) for c in set(query)), key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates.intersection_update(posting)
+            within = sorted(candidates)
+        return [i for i in within if _is_subsequence(query, self._keys[i])]
+
+    modes = 'prefix', 'substring', 'fuzzy'
+
+    def search(self, query, mode='substring', within=None):
+        """
+        :param query: (str) text to match, case-insensitive
+        :param mode: (str) 'prefix', 'substring' or 'fuzzy'
+        :param within: (list) positions to filter instead of the whole index, e.g. the result of a query this one extends
+
+        :returns: (list) positions of matching options
+        """
+        assert mode in self.modes, f"mode must be one of {self.modes}"
+        return getattr(self, mode)(query, within=within)
+
+    def rank(self, query, positions, k):
+        """
+        Returns the k best of positions: earliest match in the label first, then shortest label.
+        """
+        query = query.lower()
+        return heapq.nsmallest(k, positions, key=lambda i: (self._keys[i].find(query[:1]), len(self._keys[i]), i))
+
+    def _build_chars(self):
+        chars = {}
+        for i, key in enumerate(self._keys):
+            for c in set(key):
+                chars.setdefault(c, []).append(i)
+        self._chars = chars
+
+    def _build_trigrams(self):
+        trigrams = {}
+        for i, key in enumerate(self._keys):
+            for gram in {key[j:j + 3] for j in range(len(key) - 2)}:
+                trigrams.setdefault(gram, []).append(i)
+        self._trigrams = trigrams
+
+
+def _is_subsequence(query, key):
+    it = iter(key)
+    return all(c in it for c in query)
@@ -1,4 +1,9 @@
-import numpy as np
+import asyncio
+import contextlib
+import contextvars
+import importlib
+import sys
+
 from ipywidgets import HBox, VBox
 
 
@@ -15,26 +20,205 @@ def unwrap(item):
     return item
 
 
-def GridBox2(items: list, dims: tuple = (3, -1)):
+class LazyModule:
     """
-    Displays multiple widgets in rows and columns.
+    Stands in for a module that is imported on first attribute access.
 
-    :param items: (list) widgets to display
-    :param dims: (tuple) n_rows, n_cols
+    Usage:
+        plt = LazyModule('matplotlib.pyplot')
+    """
+    def __init__(self, name):
+        self._name = name
+        self._module = None
 
-    :returns: VBox with widgets
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+def widget_models(widget):
+    """
+    Yields widget and the layout / style models it owns.
+    """
+    yield widget
+    for name in ('layout', 'style'):
+        model = getattr(widget, name, None)
+        if model is not None and hasattr(model, 'comm'):
+            yield model
+
+
+def close_widget(widget):
+    """
+    Closes widget and its layout / style models.
+    """
+    for model in widget_models(widget):
+        model.close()
+
+
+def grid_dims(n_items: int, dims: tuple = (3, -1)):
+    """
+    Resolves grid dims so that all items fit.
+
+    :param n_items: (int) number of items
+    :param dims: (tuple) n_rows, n_cols. one dim may be < 0 to fit all items
+
+    :returns: (tuple) n_rows, n_cols
     """
-    n_items = len(items)
     n_rows, n_cols = dims
     assert (n_rows > 0) or (n_cols > 0), "At least one dim must be > 0"
     assert (n_rows != 0) and (n_cols != 0), "dims cant contain 0"
-    n_rows = int(np.ceil(n_items / n_cols)) if n_rows < 0 else n_rows
-    n_cols = int(np.ceil(n_items / n_rows)) if n_cols < 0 else n_cols
+    n_rows = -(-n_items // n_cols) if n_rows < 0 else n_rows
+    n_cols = -(-n_items // n_rows) if n_cols < 0 else n_cols
     assert (
         n_rows * n_cols >= n_items
     ), f"Specified dims: {n_rows, n_cols} won't fit all {n_items} items"
+    return n_rows, n_cols
+
+
+def GridBox2(items: list, dims: tuple = (3, -1)):
+    """
+    Displays multiple widgets in rows and columns.
+
+    :param items: (list) widgets to display
+    :param dims: (tuple) n_rows, n_cols
+
+    :returns: VBox with widgets
+    """
+    n_rows, n_cols = grid_dims(len(items), dims)
 
     HBoxs = []
     for r in range(n_rows):
         HBoxs.append(HBox(*[items[slice(n_cols * r, n_cols * (r + 1))]]))
     return VBox([*HBoxs])
+
+
+_recorder = contextvars.ContextVar('wridgets_recorder', default=None)
+
+
+class OutputRecorder:
+    """
+    Collects what a run prints or displays as Output widget output dicts.
+
+    :param outputs: (list) stream and display_data dicts in the order they were produced
+    :param cleared: (bool) True if the run called clear_output
+    """
+    def __init__(self):
+        self.outputs = []
+        self.cleared = False
+
+    def stream(self, name, text):
+        if not text:
+            return
+        last = self.outputs[-1] if self.outputs else None
+        if last is not None and last['output_type'] == 'stream' and last['name'] == name:
+            last['text'] += text
+        else:
+            self.outputs.append({'output_type': 'stream', 'name': name, 'text': text})
+
+    def display(self, data, metadata=None):
+        self.outputs.append({'output_type': 'display_data', 'data': data, 'metadata': metadata or {}})
+
+    def clear(self, wait=False):
+        self.outputs.clear()
+        self.cleared = True
+
+
+class _RoutedStream:
+    """
+    Stands in for sys.stdout / sys.stderr and sends writes to the recorder of the current thread or task, if any.
+    """
+    def __init__(self, stream, name):
+        self._stream = stream
+        self._name = name
+
+    def write(self, text):
+        recorder = _recorder.get()
+        if recorder is None:
+            return self._stream.write(text)
+        recorder.stream(self._name, text)
+        return len(text)
+
+    def __getattr__(self, attr):
+        return getattr(self._stream, attr)
+
+
+def _route_display_pub():
+    try:
+        from IPython import get_ipython
+    except ImportError:
+        return
+    shell = get_ipython()
+    pub = getattr(shell, 'display_pub', None)
+    if pub is None or getattr(pub, '_wridgets_routed', False):
+        return
+    publish, clear_output = pub.publish, pub.clear_output
+
+    def routed_publish(data, metadata=None, *args, **kwargs):
+        recorder = _recorder.get()
+        if recorder is None:
+            return publish(data, metadata, *args, **kwargs)
+        recorder.display(data, metadata)
+
+    def routed_clear_output(wait=False):
+        recorder = _recorder.get()
+        if recorder is None:
+            return clear_output(wait=wait)
+        recorder.clear(wait=wait)
+
+    pub.publish, pub.clear_output, pub._wridgets_routed = routed_publish, routed_clear_output, True
+
+
+@contextlib.contextmanager
+def capture_outputs():
+    """
+    Records what the block prints or displays instead of sending it, without touching other threads or tasks.
+
+    The recorder is bound to the current context, so it follows a coroutine across awaits and stays local to the
+    thread that opened it. Unlike `with output:`, exceptions are never swallowed.
+
+    Usage:
+        with capture_outputs() as recorder:
+            ...
+        append_outputs(output, recorder.outputs, clear=recorder.cleared)
+    """
+    for name in ('stdout', 'stderr'):
+        if not isinstance(getattr(sys, name), _RoutedStream):
+            setattr(sys, name, _RoutedStream(getattr(sys, name), name))
+    _route_display_pub()
+    recorder = OutputRecorder()
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
+
+
+def running_loop():
+    """
+    Returns the running event loop of the current thread, or None.
+    """
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def append_outputs(output, outputs, clear=False, loop=None):
+    """
+    Appends output dicts to an Output widget, replacing what it shows if clear.
+
+    :param output: (Output) widget to append to
+    :param outputs: (list) output dicts, e.g. OutputRecorder.outputs
+    :param clear: (bool) replace the current outputs
+    :param loop: (asyncio loop) loop of the kernel thread. From other threads, the append is scheduled on it
+        since widget state must be synced from the kernel thread
+    """
+    if not outputs and not clear:
+        return
+    def append():
+        output.outputs = (() if clear else output.outputs) + tuple(outputs)
+    if loop is None or loop is running_loop() or loop.is_closed():
+        append()
+    else:
+        loop.call_soon_threadsafe(append)
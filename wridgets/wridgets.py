@@ -1,8 +1,19 @@
+import asyncio
+import contextlib
+import inspect
+import io
+import threading
+import time
 import traceback
-from functools import wraps
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial, wraps
 
 from IPython.display import FileLink, clear_output, display
-from ipywidgets import VBox, HBox, Label, Layout, Style, Output, widgets, link
+# Label is left out, it names a generated wridget
+from ipywidgets import VBox, HBox, Layout, Style, Output, widgets, link
+
+from .cache import OutputCache, state_key
+from .utils import OutputRecorder, append_outputs, capture_outputs, close_widget, running_loop
 
 
 class Wridget:
@@ -12,22 +23,73 @@ class Wridget:
         'on_interact_disabled',
         'output',
         'clear_previous_output',
+        'debounce_ms',
+        'throttle_ms',
+        'latest_only',
+        'executor',
+        'supersede',
+        'pass_change',
+        'cache_size',
+        'cache_bytes',
+        'cache_key',
+    )
+    # instance state is fixed, slots keep per wridget overhead low when forms hold thousands of them
+    __slots__ = (
+        '_config', '_interact_lock', '_timer', '_last_call', '_running', '_pending', '_generation',
+        '_inflight', '_change', '_cache', '_owns_output', 'interact_stats', 'sync_stats', 'widget', '__weakref__',
     )
 
-    def __init__(self, on_interact=None, on_interact_kws=None, on_interact_disabled=None, output=None, clear_previous_output=None, **widget_kws):
+    def __init__(self, on_interact=None, on_interact_kws=None, on_interact_disabled=None, output=None, clear_previous_output=None, debounce_ms=None, throttle_ms=None, latest_only=None, executor=None, supersede=None, pass_change=None, cache_size=None, cache_bytes=None, cache_key=None, **widget_kws):
         self._config = {}
+        self._interact_lock = threading.RLock()
+        self._timer = None
+        self._last_call = None
+        self._running = False
+        self._pending = False
+        self._generation = 0
+        self._inflight = None
+        self._change = None
+        self._cache = None
+        self.interact_stats = {'events': 0, 'calls': 0, 'coalesced': 0, 'superseded': 0}
+        self.sync_stats = {'writes': 0, 'suppressed': 0}
         self.on_interact = on_interact
         self.on_interact_kws = on_interact_kws if on_interact_kws is not None else {}
         self.on_interact_disabled = on_interact_disabled if on_interact_disabled is not None else False
-        self.output = output if output is not None else Output()
+        self.output = output
         self.clear_previous_output = clear_previous_output if clear_previous_output is not None else True
+        self.debounce_ms = debounce_ms
+        self.throttle_ms = throttle_ms
+        self.latest_only = latest_only if latest_only is not None else False
+        self.executor = executor
+        self.supersede = supersede if supersede is not None else True
+        self.pass_change = pass_change if pass_change is not None else False
+        self.cache_size = cache_size
+        self.cache_bytes = cache_bytes
+        self.cache_key = cache_key
         self.widget = getattr(
             widgets, self.__class__.__name__)(**widget_kws)
         self.observe()
 
     def __init_subclass__(cls) -> None:
         for trait in cls.trait_names:
-            cls._init_trait(trait)
+            if not isinstance(getattr(Wridget, trait, None), property):
+                cls._init_trait(trait)
+
+    @property
+    def output(self):
+        """
+        Output of on_interact, created on first use unless one was given.
+        """
+        output = self._config.get('output')
+        if output is None:
+            output = self._config['output'] = Output()
+            self._owns_output = True
+        return output
+
+    @output.setter
+    def output(self, output):
+        self._owns_output = False
+        self._config.update({'output': output})
 
     @classmethod
     def _init_trait(cls, trait):
@@ -40,6 +102,34 @@ class Wridget:
         display(self.widget)
         display(self.output)
 
+    def close(self):
+        """
+        Cancels pending and in flight on_interact calls, then closes the widget and the Output if this wridget created it.
+        """
+        with self._interact_lock:
+            timer, self._timer = self._timer, None
+            inflight, self._inflight = self._inflight, None
+            self._pending = False
+        if timer is not None:
+            timer.cancel()
+        if inflight is not None:
+            inflight.cancel()
+        if self._cache is not None:
+            self._cache.clear()
+        for widget in self._own_widgets():
+            close_widget(widget)
+
+    def _own_widgets(self):
+        yield self.widget
+        if self._owns_output and self._config.get('output') is not None:
+            yield self._config['output']
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     @property
     def config(self):
         self._config.update({k: v for k, v in self.widget.trait_values().items(
@@ -58,13 +148,194 @@ class Wridget:
                 on_interact(**on_interact_kws)
             except:
                 traceback.print_exc()
+                return False
+        return True
+
+    @property
+    def cache(self):
+        """
+        LRU cache of on_interact outputs, used when cache_size is set.
+        """
+        if self._cache is None:
+            self._cache = OutputCache(maxsize=self.cache_size or 128, max_bytes=self.cache_bytes)
+        elif self.cache_size and (self._cache.maxsize, self._cache.max_bytes) != (self.cache_size, self.cache_bytes):
+            self._cache.resize(maxsize=self.cache_size, max_bytes=self.cache_bytes)
+        return self._cache
+
+    def _on_interact_cached(self, on_interact_kws):
+        """
+        Replays the outputs captured for the current widget state, or runs on_interact and captures them.
+        """
+        state = self.cache_key() if self.cache_key is not None else self.widget.value
+        key = state_key(state, {k: v for k, v in on_interact_kws.items() if k != 'owner'})
+        outputs = self.cache.get(key)
+        if outputs is not None:
+            append_outputs(self.output, outputs, clear=self.clear_previous_output)
+            return
+        # `with output:` routes to the frontend and never fills outputs, so the run is captured here
+        ok, recorder = self._capture_interact(self.on_interact, on_interact_kws)
+        append_outputs(self.output, recorder.outputs, clear=self.clear_previous_output or recorder.cleared)
+        if ok and recorder.outputs:
+            self.cache.put(key, recorder.outputs)
 
     def observe(self):
         self.widget.observe(self._observe, names='value')
 
     def _observe(self, change):
-        self._on_interact_wrapper(on_interact=self.on_interact, output=self.output,
-                                  clear_previous_output=self.clear_previous_output, on_interact_kws=self.on_interact_kws, is_disabled=self.on_interact_disabled)
+        with self._interact_lock:
+            self.interact_stats['events'] += 1
+            self._update_change(change)
+            if self.debounce_ms:
+                # restart the quiet period, dropping the event that was waiting on it
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self.interact_stats['coalesced'] += 1
+                self._timer = _call_later(self.debounce_ms / 1000, self._on_timer)
+                return
+            if self.throttle_ms:
+                if self._timer is not None:
+                    # a trailing call is already scheduled and will see the latest value
+                    self.interact_stats['coalesced'] += 1
+                    return
+                elapsed = time.monotonic() - self._last_call if self._last_call is not None else None
+                if elapsed is not None and elapsed < self.throttle_ms / 1000:
+                    self._timer = _call_later(self.throttle_ms / 1000 - elapsed, self._on_timer)
+                    return
+        self._interact()
+
+    def _update_change(self, change):
+        if not isinstance(change, dict):
+            # buttons pass the widget instead of a change dict
+            change = {'old': None, 'new': getattr(change, 'value', None), 'owner': change}
+        if self._change is not None:
+            # coalesced events keep the oldest old value
+            change = {**change, 'old': self._change['old']}
+        self._change = {'old': change.get('old'), 'new': change.get('new'), 'owner': change.get('owner')}
+
+    def _interact_kws(self):
+        """
+        Returns on_interact kwargs, with old, new and owner of the pending change if pass_change is set.
+        """
+        with self._interact_lock:
+            change, self._change = self._change, None
+        if self.pass_change and change is not None:
+            return {**self.on_interact_kws, **change}
+        return self.on_interact_kws
+
+    def _on_timer(self):
+        with self._interact_lock:
+            self._timer = None
+        self._interact()
+
+    def _interact(self):
+        with self._interact_lock:
+            if self.latest_only and self._running:
+                # the running call reruns once it finishes, so only the latest event survives
+                if self._pending:
+                    self.interact_stats['coalesced'] += 1
+                self._pending = True
+                return
+            self._running = True
+        try:
+            while True:
+                with self._interact_lock:
+                    self._pending = False
+                    self._last_call = time.monotonic()
+                    self.interact_stats['calls'] += 1
+                self._dispatch()
+                with self._interact_lock:
+                    if not self._pending:
+                        break
+        finally:
+            with self._interact_lock:
+                self._running = False
+
+    def _dispatch(self):
+        """
+        Runs on_interact inline, as a task on the running event loop if it is a coroutine function, or on the executor.
+        """
+        on_interact_kws = self._interact_kws()
+        if self.on_interact is None or self.on_interact_disabled:
+            return
+
+        is_async = inspect.iscoroutinefunction(self.on_interact)
+        if not is_async and self.executor is None:
+            if self.cache_size:
+                self._on_interact_cached(on_interact_kws)
+            else:
+                self._on_interact_wrapper(on_interact=self.on_interact, output=self.output,
+                                          clear_previous_output=self.clear_previous_output, on_interact_kws=on_interact_kws, is_disabled=self.on_interact_disabled)
+            return
+
+        with self._interact_lock:
+            self._generation += 1
+            generation = self._generation
+            previous, self._inflight = self._inflight, None
+        if self.supersede and previous is not None and previous.cancel():
+            self.interact_stats['superseded'] += 1
+
+        if is_async:
+            inflight = _create_task(self._on_interact_async(on_interact=self.on_interact, output=self.output,
+                                    clear_previous_output=self.clear_previous_output, on_interact_kws=on_interact_kws))
+        else:
+            # outputs are appended on the kernel loop, workers only capture them
+            loop = running_loop()
+            executor = _get_executor(self.executor)
+            if isinstance(executor, ProcessPoolExecutor):
+                inflight = executor.submit(_run_captured, self.on_interact, on_interact_kws)
+                inflight.add_done_callback(partial(self._on_process_done, generation, loop))
+            else:
+                inflight = executor.submit(self._run_in_thread, generation, on_interact_kws, loop)
+        with self._interact_lock:
+            self._inflight = inflight
+
+    def _is_stale(self, generation):
+        stale = self.supersede and generation != self._generation
+        if stale:
+            self.interact_stats['superseded'] += 1
+        return stale
+
+    @staticmethod
+    async def _on_interact_async(on_interact, output, clear_previous_output, on_interact_kws):
+        # the run is captured and appended once done, a cancelled run shows nothing
+        with capture_outputs() as recorder:
+            try:
+                await on_interact(**on_interact_kws)
+            except Exception:
+                traceback.print_exc()
+        append_outputs(output, recorder.outputs, clear=clear_previous_output or recorder.cleared)
+
+    @staticmethod
+    def _capture_interact(on_interact, on_interact_kws):
+        """
+        Runs on_interact and records what it prints or displays.
+
+        :returns: (tuple) True if it did not raise, OutputRecorder
+        """
+        with capture_outputs() as recorder:
+            try:
+                on_interact(**on_interact_kws)
+            except:
+                traceback.print_exc()
+                return False, recorder
+        return True, recorder
+
+    def _run_in_thread(self, generation, on_interact_kws, loop):
+        if self._is_stale(generation):
+            return
+        _, recorder = self._capture_interact(self.on_interact, on_interact_kws)
+        if not self._is_stale(generation):
+            append_outputs(self.output, recorder.outputs, clear=self.clear_previous_output or recorder.cleared, loop=loop)
+
+    def _on_process_done(self, generation, loop, future):
+        if future.cancelled() or self._is_stale(generation):
+            return
+        recorder = OutputRecorder()
+        try:
+            recorder.stream('stdout', future.result())
+        except:
+            recorder.stream('stderr', traceback.format_exc())
+        append_outputs(self.output, recorder.outputs, clear=self.clear_previous_output, loop=loop)
 
     def get(self, name):
         if name in self.trait_names:
@@ -78,11 +349,102 @@ class Wridget:
                 assert isinstance(arg, dict), 'args must be a dictionary'
                 kwargs.update(arg)
 
+        changes = {}
         for name, value in kwargs.items():
             if name in self.trait_names:
                 setattr(self, name, value)
-            elif name in self.widget.trait_names():
+            elif self.widget.has_trait(name):
+                if _is_unchanged(getattr(self.widget, name), value):
+                    self.sync_stats['suppressed'] += 1
+                else:
+                    changes[name] = value
+
+        # one state message for all changed traits
+        with self.widget.hold_sync() if len(changes) > 1 else contextlib.nullcontext():
+            for name, value in changes.items():
                 setattr(self.widget, name, value)
+        self.sync_stats['writes'] += len(changes)
+
+
+def _is_unchanged(current, value):
+    """
+    True if assigning value to a trait holding current would not change it, without running trait validation.
+
+    Sequences are compared as tuples after a length check. Tuple comparison skips identical elements by identity,
+    so re-sending the same large options list costs pointer comparisons.
+    """
+    if current is value:
+        return True
+    if isinstance(current, (list, tuple)) and isinstance(value, (list, tuple)):
+        return len(current) == len(value) and _equals(tuple(current), tuple(value))
+    # 1 == True and 1 == 1.0 but the trait values differ
+    return type(current) is type(value) and _equals(current, value)
+
+
+def _equals(a, b):
+    try:
+        return bool(a == b)
+    except Exception:
+        # e.g. arrays, whose == is elementwise
+        return False
+
+
+def _call_later(delay, func):
+    """
+    Schedules func after delay seconds on the running event loop, or on a timer thread if there is none.
+
+    :returns: handle with a cancel method
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        timer = threading.Timer(delay, func)
+        timer.daemon = True
+        timer.start()
+        return timer
+    return loop.call_later(delay, func)
+
+
+def _create_task(coro):
+    """
+    Schedules coro on the running event loop, or runs it to completion if there is none.
+
+    :returns: task, or None if coro already ran
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(coro)
+        return None
+    return loop.create_task(coro)
+
+
+_executors = {}
+
+
+def _get_executor(executor):
+    """
+    Resolves 'thread' or 'process' to a shared pool. Executor instances are returned as is.
+    """
+    if isinstance(executor, Executor):
+        return executor
+    assert executor in ('thread', 'process'), "executor must be 'thread', 'process' or a concurrent.futures.Executor"
+    if executor not in _executors:
+        _executors[executor] = ThreadPoolExecutor() if executor == 'thread' else ProcessPoolExecutor()
+    return _executors[executor]
+
+
+def _run_captured(on_interact, on_interact_kws):
+    """
+    Runs on_interact in a worker process and returns its stdout, since Output widgets cannot capture across processes.
+    """
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout):
+        try:
+            on_interact(**on_interact_kws)
+        except:
+            traceback.print_exc(file=stdout)
+    return stdout.getvalue()
 
 
 wridget_list = [
@@ -135,8 +497,16 @@ wridget_list = [
     'Video',
 ]
 
+# star imports go through __getattr__ for the generated classes
+__all__ = [
+    'FileLink', 'HBox', 'Layout', 'Output', 'Style', 'VBox', 'clear_output', 'display', 'link', 'widgets',
+    'Wridget', 'wridget_list', *wridget_list,
+]
+
 
 class Button(Wridget):
+    __slots__ = ()
+
     @wraps(Wridget.__init__, assigned=['__signature__'])
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -152,14 +522,20 @@ def _wridget_constructor(self, *args, **kwargs):
     Wridget.__init__(self, *args, **kwargs)
 
 
-def _initialize_wridgets():
-    for wridget in wridget_list:
-        if wridget == 'Button':
-            continue
+def _make_wridget(name):
+    return type(name, (Wridget, ), {
+        "__init__": _wridget_constructor,
+        "__slots__": (),
+    })
+
 
-        globals()[wridget] = type(wridget, (Wridget, ), {
-            "__init__": _wridget_constructor,
-        })
+def __getattr__(name):
+    # wridget classes are generated on first access to keep import fast
+    if name in wridget_list:
+        globals()[name] = _make_wridget(name)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-_initialize_wridgets()
+def __dir__():
+    return sorted(set(globals()) | set(wridget_list))